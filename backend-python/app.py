@@ -1,15 +1,19 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import json
 from pathlib import Path
 import threading
 
-from utils.ReplayGetter import parse_and_analyze
-from utils.ReplayWatcher import start_replay_watcher
-from utils.AIAnalysis.match_analysis import run_match_analysis
-from utils.AIAnalysis.feedback.llm_assistant import generate_ai_feedback
+from utils.ReplayWatcher import start_replay_watcher, mark_pending, release_pending, track_submitted
+from utils.ingest_scheduler import get_scheduler, QueueFull, PRIORITY_INTERACTIVE
+from utils.AIAnalysis.feedback.llm_assistant import stream_feedback_to_report
 from utils.AIAnalysis.utils import ensure_project_dirs
+from utils.pipeline_events import broadcaster
+from utils.report_store import (
+    ANALYSIS_RESULTS_DIR, artifact_etag, etag_matches, select_variant, project_report,
+    projection_etag, list_reports
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -24,36 +28,137 @@ def upload_replay():
         return jsonify({"error": "No file provided."}), 400
 
     replay_file = request.files["file"]
-    save_path = os.path.join(REPLAY_UPLOAD_DIR, replay_file.filename)
-    replay_file.save(save_path)
+    save_path = Path(REPLAY_UPLOAD_DIR) / Path(replay_file.filename).name
+    # Claimed before the file lands in the watched folder so the watcher skips it
+    mark_pending(save_path.name)
 
     try:
-        print("📦 Parsing new replay...")
-        parsed_matches = parse_and_analyze()
+        replay_file.save(save_path)
+        print("📦 Queueing uploaded replay...")
+        job = get_scheduler().submit(save_path, PRIORITY_INTERACTIVE)
+    except QueueFull:
+        release_pending(save_path.name)
+        return jsonify({"error": "Server is busy, try again shortly."}), 503
+    except Exception:
+        release_pending(save_path.name)
+        raise
+    track_submitted(save_path.name, job)
 
-        if not parsed_matches:
-            return jsonify({"error": "No new matches parsed."}), 500
-
-        latest_report = parsed_matches[-1]
-        print("📊 Running match analysis...")
-        analysis = run_match_analysis(latest_report)
+    try:
+        parsed = job.result()
+        if not parsed:
+            return jsonify({"error": "Replay could not be parsed."}), 500
 
-        # print("🧠 Generating LLM feedback...")
-        # feedback = generate_ai_feedback(analysis)
+        report_path = ANALYSIS_RESULTS_DIR / save_path.stem / "analysis_full.json"
+        summary = parsed.get("analysis", {}).get("summary", {})
+        if report_path.exists():
+            with open(report_path, "r", encoding="utf-8") as f:
+                summary = json.load(f).get("analysis", {}).get("summary", summary)
 
-        # return jsonify({
-        #     "feedback": feedback,
-        #     "summary": analysis.get("summary", {})
-        # })
+        return jsonify({"replay": save_path.stem, "summary": summary})
 
     except Exception as e:
         print(f"❌ Upload processing failed: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/queue")
+def queue_status():
+    """
+    Ingestion queue depth per priority class and memory in use.
+    """
+    return jsonify(get_scheduler().stats())
+
+def serve_artifact(path, mimetype, fields=None):
+    """
+    Serve a stored artifact with a content-hash ETag, answering If-None-Match with 304.
+    Whole files come from their precompressed variants when the client accepts them;
+    with `fields`, only those parts of a JSON report are returned.
+    """
+    if not path.exists():
+        return jsonify({"error": "Report not found."}), 404
+
+    etag = artifact_etag(path)
+    if fields:
+        tag = projection_etag(etag, fields)
+    else:
+        variant, encoding, suffix = select_variant(path, request.headers.get("Accept-Encoding"))
+        tag = etag + suffix
+
+    headers = {"ETag": f'"{tag}"', "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status=304, headers=headers)
+
+    if fields:
+        body = json.dumps(project_report(path, etag, fields), separators=(",", ":"))
+        return Response(body, mimetype=mimetype, headers=headers)
+
+    with open(variant, "rb") as f:
+        body = f.read()
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, mimetype=mimetype, headers=headers)
+
+@app.route("/reports")
+def reports_index():
+    return jsonify({"reports": list_reports()})
+
+@app.route("/reports/<replay>")
+def get_report(replay):
+    """
+    Stored analysis report. ?fields=summary,combat returns only those sections.
+    """
+    if Path(replay).name != replay:
+        return jsonify({"error": "Report not found."}), 404
+    fields = [f for f in request.args.get("fields", "").split(",") if f]
+    return serve_artifact(ANALYSIS_RESULTS_DIR / replay / "analysis_full.json", "application/json", fields)
+
+@app.route("/reports/<replay>/feedback")
+def get_report_feedback(replay):
+    if Path(replay).name != replay:
+        return jsonify({"error": "Report not found."}), 404
+    return serve_artifact(ANALYSIS_RESULTS_DIR / replay / "feedback.txt", "text/plain")
+
+@app.route("/events")
+def pipeline_events():
+    """
+    Server-Sent Events stream of pipeline progress (detected, started, parsed, analyzed, feedback_ready or done).
+    """
+    return Response(
+        stream_with_context(broadcaster.stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/feedback/<replay>/stream")
+def stream_feedback(replay):
+    """
+    Stream coaching feedback for an analyzed replay as it is generated (chunked text).
+    Feedback that is already stored is served as is, so only the first request
+    for a replay analyzed without feedback calls the LLM.
+    The final text is stored in the report (feedback.txt, feedback.json, analysis_full.json) once complete.
+    """
+    result_dir = ANALYSIS_RESULTS_DIR / replay
+    report_path = result_dir / "analysis_full.json"
+    if Path(replay).name != replay or not report_path.exists():
+        return jsonify({"error": "Replay not found."}), 404
+
+    feedback_path = result_dir / "feedback.txt"
+    if feedback_path.exists():
+        return serve_artifact(feedback_path, "text/plain")
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    return Response(
+        stream_with_context(stream_feedback_to_report(report, str(result_dir))),
+        mimetype="text/plain",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == "__main__":
     # 👀 Start replay watcher in the background
     watcher_thread = threading.Thread(target=start_replay_watcher, daemon=True)
     watcher_thread.start()
 
     print("🚀 Starting Flask server...")
-    app.run(port=5000)
+    app.run(port=5000, threaded=True)
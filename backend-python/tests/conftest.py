@@ -0,0 +1,6 @@
+# File: backend-python/tests/conftest.py
+
+import os
+
+# Analysis modules import the feedback client; use the local stub instead of OpenAI
+os.environ.setdefault("LLM_STUB_DELAY", "0")
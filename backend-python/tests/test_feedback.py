@@ -0,0 +1,211 @@
+# File: backend-python/tests/test_feedback.py
+
+import functools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from utils.AIAnalysis import match_analysis
+from utils.AIAnalysis.feedback import llm_assistant
+from utils.report_store import save_json_artifact
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+@pytest.fixture(autouse=True)
+def training_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_assistant, "TRAINING_DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def stored_report(tmp_path):
+    report = {"analysis": {"summary": {"kills": 2}}, "ai_feedback": None}
+    save_json_artifact(tmp_path / "analysis_full.json", report)
+    return tmp_path, report
+
+
+def test_streamed_feedback_is_stored_in_the_report(stored_report):
+    result_dir, report = stored_report
+    text = "".join(llm_assistant.stream_feedback_to_report(report, result_dir))
+
+    assert text.strip() == (result_dir / "feedback.txt").read_text()
+    assert json.loads((result_dir / "feedback.json").read_text()) == text.strip()
+    assert json.loads((result_dir / "analysis_full.json").read_text())["ai_feedback"] == text.strip()
+
+
+def test_stream_failure_mid_way_saves_nothing(stored_report, monkeypatch):
+    result_dir, report = stored_report
+
+    def broken_stream(**kwargs):
+        yield _chunk("Partial ")
+        raise RuntimeError("connection dropped")
+
+    monkeypatch.setattr(llm_assistant.client.chat.completions, "create", broken_stream)
+    with pytest.raises(RuntimeError):
+        list(llm_assistant.stream_feedback_to_report(report, result_dir))
+    assert not (result_dir / "feedback.txt").exists()
+    assert json.loads((result_dir / "analysis_full.json").read_text())["ai_feedback"] is None
+
+
+def test_stream_failure_before_any_token_falls_back_to_rules(stored_report, monkeypatch):
+    result_dir, report = stored_report
+
+    def unreachable(**kwargs):
+        raise ConnectionError("LLM down")
+
+    monkeypatch.setattr(llm_assistant.client.chat.completions, "create", unreachable)
+    text = "".join(llm_assistant.stream_feedback_to_report(report, result_dir))
+    assert text == llm_assistant.generate_rule_feedback(report)
+    assert (result_dir / "feedback.txt").read_text() == text
+
+
+# -----------------------------
+# Deadline race
+# -----------------------------
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace the LLM call with one that answers `text` once `gate` is set."""
+    state = SimpleNamespace(text="LLM feedback", gate=threading.Event(), calls=0)
+    state.gate.set()
+
+    def fake_request(report):
+        state.calls += 1
+        state.gate.wait(5)
+        return state.text
+
+    monkeypatch.setattr(llm_assistant, "request_llm_feedback", fake_request)
+    return state
+
+
+def test_zero_deadline_skips_the_llm(llm):
+    feedback, llm_feedback = llm_assistant.start_ai_feedback({}, deadline=0)
+    assert feedback == llm_assistant.generate_rule_feedback({})
+    assert llm_feedback is None and llm.calls == 0
+
+
+def test_local_feedback_is_returned_before_the_llm_answers(llm):
+    llm.gate.clear()
+    start = time.monotonic()
+    feedback, llm_feedback = llm_assistant.start_ai_feedback({}, deadline=1)
+    assert time.monotonic() - start < 0.5
+    assert feedback == llm_assistant.generate_rule_feedback({})
+    llm.gate.set()
+    assert llm_feedback.result(timeout=2) == "LLM feedback"
+
+
+def test_late_answer_is_dropped(llm):
+    llm.gate.clear()
+    _, llm_feedback = llm_assistant.start_ai_feedback({}, deadline=0.05)
+    time.sleep(0.1)
+    llm.gate.set()
+    assert llm_feedback.result(timeout=2) is None
+    assert llm.calls == 1
+
+
+def test_queued_call_is_cancelled_at_the_deadline(llm, monkeypatch):
+    monkeypatch.setattr(llm_assistant, "_llm_executor", ThreadPoolExecutor(max_workers=1))
+    llm.gate.clear()
+    _, running = llm_assistant.start_ai_feedback({}, deadline=0.05)
+    _, queued = llm_assistant.start_ai_feedback({}, deadline=0.05)
+    assert queued.result(timeout=1) is None
+    llm.gate.set()
+    assert running.result(timeout=2) is None
+    llm_assistant._llm_executor.shutdown(wait=True)
+    assert llm.calls == 1
+
+
+def test_failed_llm_call_resolves_to_none(monkeypatch):
+    def unreachable(**kwargs):
+        raise ConnectionError("LLM down")
+
+    monkeypatch.setattr(llm_assistant.client.chat.completions, "create", unreachable)
+    assert llm_assistant.request_llm_feedback({}) is None
+    _, llm_feedback = llm_assistant.start_ai_feedback({}, deadline=1)
+    assert llm_feedback.result(timeout=2) is None
+    assert llm_assistant.generate_ai_feedback({}, deadline=1) == llm_assistant.generate_rule_feedback({})
+
+
+def test_generate_ai_feedback_blocks_until_answer_or_deadline(llm):
+    assert llm_assistant.generate_ai_feedback({}, deadline=1) == "LLM feedback"
+    llm.gate.clear()
+    assert llm_assistant.generate_ai_feedback({}, deadline=0.05) == llm_assistant.generate_rule_feedback({})
+    llm.gate.set()
+
+
+def test_fast_llm_answer_is_not_overwritten_by_the_first_save(llm, tmp_path, monkeypatch):
+    # The LLM answers before the report is first saved with the local feedback
+    first_save = threading.Event()
+    save_json_artifact = match_analysis.save_json_artifact
+
+    def slow_first_save(path, obj):
+        if not first_save.is_set():
+            first_save.set()
+            time.sleep(0.2)
+        save_json_artifact(path, obj)
+
+    monkeypatch.setattr(match_analysis, "save_json_artifact", slow_first_save)
+    answered = threading.Event()
+    updated = {}
+
+    def on_llm_feedback(report):
+        updated.update(report)
+        answered.set()
+
+    report = match_analysis.run_match_analysis({"events": ["Elimination"]}, str(tmp_path),
+                                               on_llm_feedback=on_llm_feedback)
+    assert report["ai_feedback"] == llm_assistant.generate_rule_feedback(report)
+    assert answered.wait(2)
+    assert updated["ai_feedback"] == "LLM feedback"
+    assert json.loads((tmp_path / "analysis_full.json").read_text())["ai_feedback"] == "LLM feedback"
+    assert (tmp_path / "feedback.txt").read_text() == "LLM feedback"
+    assert json.loads((tmp_path / "feedback.json").read_text()) == "LLM feedback"
+
+
+# -----------------------------
+# Fine-tuning examples
+# -----------------------------
+
+def _ingest(tmp_path, monkeypatch, deadline):
+    from utils import ReplayGetter
+
+    monkeypatch.setattr(ReplayGetter, "TRAINING_DATA_DIR", tmp_path)
+    monkeypatch.setattr(match_analysis, "start_ai_feedback",
+                        functools.partial(llm_assistant.start_ai_feedback, deadline=deadline))
+    output_dir = tmp_path / "match"
+    output_dir.mkdir()
+    parsed = {"events": ["Elimination PlayerId=a"], "analysis": {"combat": {"eliminations": 1}}}
+    ReplayGetter.handle_new_replay(parsed, str(output_dir))
+    return output_dir
+
+
+def test_training_example_holds_the_llm_answer(llm, tmp_path, monkeypatch):
+    output_dir = _ingest(tmp_path, monkeypatch, deadline=1)
+    for _ in range(100):
+        examples = list(tmp_path.glob("match_*.json"))
+        if examples:
+            break
+        time.sleep(0.02)
+    (example_path,) = examples
+    example = json.loads(example_path.read_text())
+    assert example["output"] == {"feedback": "LLM feedback", "source": "llm"}
+    assert "ai_feedback" not in example["input"]["analysis"]
+    assert json.loads((output_dir / "feedback.json").read_text()) == "LLM feedback"
+
+
+def test_no_training_example_without_an_llm_answer(llm, tmp_path, monkeypatch):
+    llm.gate.clear()
+    output_dir = _ingest(tmp_path, monkeypatch, deadline=0.05)
+    time.sleep(0.1)
+    llm.gate.set()
+    time.sleep(0.1)
+    assert not list(tmp_path.glob("match_*.json"))
+    stored = json.loads((output_dir / "analysis_full.json").read_text())["ai_feedback"]
+    assert stored == json.loads((output_dir / "feedback.json").read_text()) != "LLM feedback"
@@ -0,0 +1,238 @@
+# File: backend-python/tests/test_ingest_scheduler.py
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from utils import replayWatcher
+from utils.ingest_scheduler import (
+    MEMORY_BASE_BYTES,
+    PRIORITY_BACKLOG,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_WATCHER,
+    IngestScheduler,
+    QueueFull,
+    estimate_job_memory,
+)
+from utils.pipeline_events import broadcaster
+
+MB = 1024 * 1024
+
+
+class GatedHandler:
+    """Records which replays started and holds each one until released."""
+
+    def __init__(self):
+        self.started = []
+        self._gates = {}
+        self._cond = threading.Condition()
+
+    def __call__(self, replay_path):
+        with self._cond:
+            self.started.append(replay_path.stem)
+            gate = self._gates.setdefault(replay_path.stem, threading.Event())
+            self._cond.notify_all()
+        gate.wait(5)
+        return replay_path.stem
+
+    def release(self, *names):
+        with self._cond:
+            for name in names:
+                self._gates.setdefault(name, threading.Event()).set()
+
+    def wait_started(self, count):
+        with self._cond:
+            assert self._cond.wait_for(lambda: len(self.started) >= count, 5)
+
+
+@pytest.fixture(autouse=True)
+def quiet_broadcaster(monkeypatch):
+    monkeypatch.setattr(broadcaster, "publish", lambda *args, **kwargs: None)
+
+
+@pytest.fixture
+def handler():
+    handler = GatedHandler()
+    yield handler
+    handler.release(*handler.started, *"abcdefgh")
+
+
+def _scheduler(handler, **kwargs):
+    return IngestScheduler(handler, **kwargs)
+
+
+def _replay(tmp_path, name, size=0):
+    path = tmp_path / f"{name}.replay"
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+def test_estimate_job_memory(tmp_path):
+    assert estimate_job_memory(_replay(tmp_path, "a", 1000)) == MEMORY_BASE_BYTES + 12 * 1000
+    assert estimate_job_memory(tmp_path / "missing.replay") == MEMORY_BASE_BYTES
+
+
+def test_strict_priority_order(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=1)
+    first = scheduler.submit(_replay(tmp_path, "a"), PRIORITY_BACKLOG)
+    handler.wait_started(1)
+
+    scheduler.submit(_replay(tmp_path, "b"), PRIORITY_BACKLOG)
+    scheduler.submit(_replay(tmp_path, "c"), PRIORITY_WATCHER)
+    last = scheduler.submit(_replay(tmp_path, "d"), PRIORITY_INTERACTIVE)
+    assert scheduler.stats()["queued"] == {"interactive": 1, "watcher": 1, "backlog": 1}
+
+    handler.release("a", "b", "c", "d")
+    assert first.result(5) == "a"
+    scheduler.shutdown()
+    assert handler.started == ["a", "d", "c", "b"]
+    assert last.result() == "d"
+    assert scheduler.stats()["completed"] == 4
+
+
+def test_jobs_run_together_within_the_memory_budget(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=3, memory_budget_mb=2 * MEMORY_BASE_BYTES // MB)
+    for name in "abc":
+        scheduler.submit(_replay(tmp_path, name))
+    handler.wait_started(2)
+    time.sleep(0.05)
+
+    stats = scheduler.stats()
+    assert stats["running"] == 2 and stats["queued"]["backlog"] == 1
+    assert stats["memory_in_use_mb"] == 2 * MEMORY_BASE_BYTES / MB
+
+    handler.release("a")
+    handler.wait_started(3)
+    handler.release("b", "c")
+    scheduler.shutdown()
+    assert handler.started == ["a", "b", "c"]
+
+
+def test_job_larger_than_the_budget_runs_alone(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=2, memory_budget_mb=MEMORY_BASE_BYTES // MB // 2)
+    scheduler.submit(_replay(tmp_path, "a"))
+    scheduler.submit(_replay(tmp_path, "b"))
+    handler.wait_started(1)
+    time.sleep(0.05)
+    assert scheduler.stats()["running"] == 1
+
+    handler.release("a")
+    handler.wait_started(2)
+    handler.release("b")
+    scheduler.shutdown()
+    assert scheduler.stats()["completed"] == 2
+
+
+def test_urgent_job_waiting_for_memory_blocks_smaller_jobs(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=2, memory_budget_mb=3 * MEMORY_BASE_BYTES // MB)
+    scheduler.submit(_replay(tmp_path, "a", 2 * MEMORY_BASE_BYTES // 12))
+    handler.wait_started(1)
+    # "b" needs more than is left; the smaller backlog job "c" must not overtake it
+    scheduler.submit(_replay(tmp_path, "b", 2 * MEMORY_BASE_BYTES // 12), PRIORITY_INTERACTIVE)
+    scheduler.submit(_replay(tmp_path, "c"), PRIORITY_BACKLOG)
+    time.sleep(0.05)
+    assert handler.started == ["a"]
+
+    handler.release("a")
+    handler.wait_started(2)
+    assert handler.started == ["a", "b"]
+    handler.release("b", "c")
+    scheduler.shutdown()
+    assert handler.started == ["a", "b", "c"]
+
+
+def test_full_queue_raises(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=1, max_depth=(1, 1, 1))
+    scheduler.submit(_replay(tmp_path, "a"))
+    handler.wait_started(1)
+    scheduler.submit(_replay(tmp_path, "b"))
+
+    with pytest.raises(QueueFull):
+        scheduler.submit(_replay(tmp_path, "c"))
+    with pytest.raises(QueueFull):
+        scheduler.submit(_replay(tmp_path, "c"), block=True, timeout=0.05)
+    # Other priority classes have their own limit
+    scheduler.submit(_replay(tmp_path, "d"), PRIORITY_WATCHER)
+
+    handler.release("a", "b", "d")
+    scheduler.shutdown()
+
+
+def test_blocking_submit_waits_for_room(tmp_path, handler):
+    scheduler = _scheduler(handler, workers=1, max_depth=(1, 1, 1))
+    scheduler.submit(_replay(tmp_path, "a"))
+    handler.wait_started(1)
+    scheduler.submit(_replay(tmp_path, "b"))
+
+    submitted = []
+    submitter = threading.Thread(
+        target=lambda: submitted.append(scheduler.submit(_replay(tmp_path, "c"), block=True, timeout=5))
+    )
+    submitter.start()
+    time.sleep(0.05)
+    assert not submitted
+
+    # "b" leaves the queue when "a" finishes, which makes room for "c"
+    handler.release("a")
+    submitter.join(5)
+    assert len(submitted) == 1
+
+    handler.release("b", "c")
+    assert submitted[0].result(5) == "c"
+    scheduler.shutdown()
+
+
+def test_handler_errors_reach_the_future(tmp_path):
+    def failing(replay_path):
+        raise ValueError("bad replay")
+
+    scheduler = _scheduler(failing, workers=1)
+    future = scheduler.submit(_replay(tmp_path, "a"))
+    with pytest.raises(ValueError):
+        future.result(5)
+    scheduler.shutdown()
+    with pytest.raises(RuntimeError):
+        scheduler.submit(_replay(tmp_path, "b"))
+
+
+# -----------------------------
+# Watcher bookkeeping
+# -----------------------------
+
+@pytest.fixture
+def watcher_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(replayWatcher, "PROCESSED_LOG", tmp_path / "processed_replays.json")
+    monkeypatch.setattr(replayWatcher, "processed", set())
+    monkeypatch.setattr(replayWatcher, "pending", set())
+    return tmp_path / "processed_replays.json"
+
+
+def test_mark_and_release_pending(watcher_state):
+    replayWatcher.mark_pending("a.replay")
+    assert replayWatcher.pending == {"a.replay"}
+    replayWatcher.release_pending("a.replay")
+    assert replayWatcher.pending == set()
+
+
+def test_tracked_replay_is_processed_when_done(watcher_state):
+    future = Future()
+    replayWatcher.track_submitted("a.replay", future)
+    assert replayWatcher.pending == {"a.replay"}
+    assert not watcher_state.exists()
+
+    future.set_result(None)
+    assert replayWatcher.pending == set()
+    assert replayWatcher.processed == {"a.replay"}
+    assert json.loads(watcher_state.read_text()) == {"processed": ["a.replay"]}
+
+
+def test_failed_replay_is_not_marked_processed(watcher_state):
+    future = Future()
+    replayWatcher.track_submitted("a.replay", future)
+    future.set_exception(ValueError("bad replay"))
+    assert replayWatcher.pending == set()
+    assert replayWatcher.processed == set()
+    assert not watcher_state.exists()
@@ -0,0 +1,55 @@
+# File: backend-python/tests/test_match_analysis.py
+
+from utils.AIAnalysis.match_analysis import (
+    PLAYER_ID_KEY,
+    analyze_events,
+    partition_events_by_player,
+    run_lobby_analysis,
+)
+
+
+def test_partition_groups_events_by_player():
+    events = [
+        {"type": "damage", "player_id": "a", "amount": 10},
+        {"type": "damage", "player_id": "b", "amount": 20},
+        {"type": "elimination", "player_id": "a"},
+    ]
+    partitions = partition_events_by_player(events)
+    assert list(partitions) == ["a", "b"]
+    assert [e["type"] for e in partitions["a"]] == ["damage", "elimination"]
+    assert partitions["b"] == [events[1]]
+
+
+def test_partition_shares_events_without_player_id():
+    zone = {"type": "new_zone", "center": (0, 0), "time": 10}
+    storm = {"type": "new_zone", "center": (5, 5), "time": 60}
+    events = [
+        {"type": "jump", "player_id": "a"},
+        zone,
+        {"type": "jump", "player_id": "b"},
+        storm,
+    ]
+    partitions = partition_events_by_player(events)
+    assert partitions["a"] == [events[0], zone, storm]
+    # A late joiner still gets the shared events seen before it appeared
+    assert partitions["b"] == [zone, events[2], storm]
+
+
+def test_partition_of_events_without_players_is_empty():
+    assert partition_events_by_player([{"type": "new_zone"}]) == {}
+
+
+def test_lobby_table_has_one_row_per_player():
+    events_by_player = {
+        "a": [{"type": "damage", "amount": 50, "target": "enemy"}],
+        "b": [{"type": "jump"}],
+    }
+    table = run_lobby_analysis(events_by_player)
+    assert table["columns"][0] == PLAYER_ID_KEY
+    assert [row[0] for row in table["rows"]] == ["a", "b"]
+    summary = analyze_events(events_by_player["a"])["summary"]
+    assert table["rows"][0][1:] == list(summary.values())
+
+
+def test_lobby_table_without_players():
+    assert run_lobby_analysis({}) == {"columns": [PLAYER_ID_KEY], "rows": []}
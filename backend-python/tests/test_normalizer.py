@@ -0,0 +1,49 @@
+# File: backend-python/tests/test_normalizer.py
+
+import pytest
+
+from utils.fortnite_replay_parser.normalizer import EVENT_TYPES, EventRecord, normalize_events
+
+
+def test_normalize_typed_fields():
+    damage, taken, build = normalize_events([
+        "DamageDealt: 35 PlayerId=abc",
+        "DamageTaken 12",
+        "BuildPlaced Metal Player: p-2",
+    ])
+    assert damage.to_dict() == {"type": "damage", "player_id": "abc", "amount": 35, "target": "enemy"}
+    assert taken.to_dict() == {"type": "damage", "amount": 12, "target": "self"}
+    assert build.to_dict() == {"type": "build", "player_id": "p-2", "material": "metal"}
+
+
+def test_earliest_trigger_wins():
+    (event,) = normalize_events(["Headshot Elimination"])
+    assert event["type"] == "headshot"
+
+
+def test_unmatched_texts_are_dropped_and_structured_events_pass_through():
+    structured = {"type": "movement", "distance": 3.0}
+    assert normalize_events(["Nothing to see", structured]) == [structured]
+
+
+def test_player_ids_are_shared_between_records():
+    first, second = normalize_events(["Jump PlayerId=" + "x" * 3, "Kill PlayerId=" + "xx" + "x"])
+    assert first["player_id"] is second["player_id"]
+
+
+def test_record_dict_access():
+    record = EventRecord(EVENT_TYPES.index("damage"), amount=5)
+    assert record["type"] == "damage"
+    assert record.get("amount", 0) == 5
+    assert record.get("player_id") is None
+    assert record.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        record["target"]
+
+
+def test_internal_code_is_not_a_field():
+    record = EventRecord(EVENT_TYPES.index("damage"), amount=5)
+    with pytest.raises(KeyError):
+        record["code"]
+    assert record.get("code") is None
+    assert "code" not in record.to_dict()
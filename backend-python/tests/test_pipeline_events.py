@@ -0,0 +1,84 @@
+# File: backend-python/tests/test_pipeline_events.py
+
+import json
+
+from utils.pipeline_events import EventBroadcaster
+
+
+def _decode(message: str):
+    lines = message.strip().split("\n")
+    event = lines[1].removeprefix("event: ")
+    return event, json.loads(lines[2].removeprefix("data: "))
+
+
+def _drain(q):
+    messages = []
+    while not q.empty():
+        messages.append(_decode(q.get_nowait()))
+    return messages
+
+
+def test_messages_carry_only_changed_fields():
+    broadcaster = EventBroadcaster()
+    q = broadcaster.subscribe()
+    broadcaster.publish("m1", "detected", file="m1.replay", queue="watcher")
+    broadcaster.publish("m1", "parsed", file="m1.replay", chunks=12)
+    assert _drain(q) == [
+        ("detected", {"replay": "m1", "stage": "detected", "file": "m1.replay", "queue": "watcher"}),
+        ("parsed", {"replay": "m1", "stage": "parsed", "chunks": 12}),
+    ]
+
+
+def test_final_stage_drops_replay_state():
+    broadcaster = EventBroadcaster()
+    broadcaster.publish("m1", "analyzed", summary={"kills": 1})
+    broadcaster.publish("m1", "done")
+    assert broadcaster._state == {} and broadcaster._stages == {}
+    q = broadcaster.subscribe()
+    # Same fields are sent again for a new run of the replay
+    broadcaster.publish("m1", "analyzed", summary={"kills": 1})
+    assert _drain(q)[0][1]["summary"] == {"kills": 1}
+
+
+def test_fan_out_to_every_subscriber():
+    broadcaster = EventBroadcaster()
+    queues = [broadcaster.subscribe() for _ in range(3)]
+    broadcaster.publish("m1", "detected")
+    assert all(len(_drain(q)) == 1 for q in queues)
+    broadcaster.unsubscribe(queues[0])
+    broadcaster.publish("m1", "started")
+    assert [len(_drain(q)) for q in queues] == [0, 1, 1]
+    assert broadcaster.subscriber_count() == 2
+
+
+def test_slow_subscriber_drops_oldest_message():
+    broadcaster = EventBroadcaster(max_queue=2)
+    q = broadcaster.subscribe()
+    for n in range(4):
+        broadcaster.publish(f"m{n}", "detected")
+    assert [data["replay"] for _, data in _drain(q)] == ["m2", "m3"]
+
+
+def test_stream_starts_with_snapshot_of_replays_in_progress():
+    broadcaster = EventBroadcaster()
+    broadcaster.publish("m1", "detected", file="m1.replay")
+    broadcaster.publish("m1", "parsed", chunks=3)
+    broadcaster.publish("m2", "failed", error="bad")
+    stream = broadcaster.stream()
+    assert next(stream) == ": connected\n\n"
+    event, data = _decode(next(stream))
+    assert event == "snapshot"
+    assert data == {"replays": {"m1": {"stage": "parsed", "file": "m1.replay", "chunks": 3}}}
+
+    broadcaster.publish("m1", "analyzed", summary={})
+    assert _decode(next(stream))[0] == "analyzed"
+    stream.close()
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_stream_without_replays_in_progress_has_no_snapshot():
+    broadcaster = EventBroadcaster()
+    stream = broadcaster.stream(heartbeat=0.01)
+    assert next(stream) == ": connected\n\n"
+    assert next(stream) == ": keep-alive\n\n"
+    stream.close()
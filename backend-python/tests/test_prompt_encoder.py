@@ -0,0 +1,92 @@
+# File: backend-python/tests/test_prompt_encoder.py
+
+from utils.AIAnalysis.feedback.prompt_encoder import (
+    PROMPT_FOOTER,
+    PROMPT_HEADER,
+    encode_match_prompt,
+    encode_section,
+    estimate_tokens,
+)
+
+
+def _report(rotations: int = 40):
+    return {
+        "analysis": {
+            "summary": {"kills": 3, "accuracy": 41.5, "positioning_score": 70, "rotation_score": 85, "zone_safety": 12},
+            "combat": {"eliminations": 3, "damage_given": 640},
+            "rotation": {
+                "rotations": [
+                    {"distance": 100.0 + i, "time_between": 60 + i} for i in range(rotations)
+                ],
+                "score": 85,
+            },
+            "positioning": {"time_in_cover": 120, "score": 70},
+            "loadout": {"AR": {"uses": 40, "damage": 400}, "Shotgun": {"uses": 6, "damage": 240}},
+            "enemy_proximity": {"encounters": 9, "avg_distance": 31.25},
+        }
+    }
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("kills=3") == 4
+    assert estimate_tokens("elimination") == 3
+    assert estimate_tokens("a, b.") == 4
+
+
+def test_encode_section_scalars():
+    assert encode_section("combat", {"kills": 3, "accuracy": 0.5, "tags": ["a", "b"]}) == "combat: kills=3 accuracy=0.5 tags=a/b"
+    assert encode_section("combat", {}) == "combat: none"
+    assert encode_section("score", 1.25) == "score: 1.25"
+
+
+def test_encode_section_list_of_records():
+    rows = [{"distance": 10.0, "time": 5}, {"distance": 20.0, "time": 7}]
+    assert encode_section("rotations", rows) == "rotations[distance|time]: 10|5; 20|7"
+    assert encode_section("rotations", rows, max_rows=1) == (
+        "rotations: n=2 distance=mean 15 min 10 max 20 time=mean 6 min 5 max 7"
+    )
+
+
+def test_encode_section_dict_of_records():
+    loadout = {"AR": {"uses": 40}, "Shotgun": {"uses": 6}}
+    assert encode_section("loadout", loadout) == "loadout[name|uses]: AR|40; Shotgun|6"
+
+
+def test_encode_section_nested_table():
+    encoded = encode_section("rotation", {"score": 85, "rotations": [{"distance": 1}]})
+    assert encoded == "rotation: score=85\nrotation.rotations[distance]: 1"
+
+
+def test_prompt_within_budget_keeps_every_row():
+    prompt, tokens = encode_match_prompt(_report(rotations=3), token_budget=10_000)
+    assert prompt.startswith(PROMPT_HEADER) and prompt.endswith(PROMPT_FOOTER)
+    assert "rotation.rotations[distance|time_between]" in prompt
+    assert tokens == estimate_tokens(prompt)
+
+
+def test_long_lists_are_summarized_before_sections_are_dropped():
+    full, full_tokens = encode_match_prompt(_report(rotations=15), token_budget=10_000)
+    assert "rotation.rotations[distance|time_between]" in full
+    budget = full_tokens - 1
+    prompt, tokens = encode_match_prompt(_report(rotations=15), token_budget=budget)
+    assert tokens <= budget
+    assert "rotation.rotations: n=15" in prompt
+    assert "enemy_proximity:" in prompt
+
+
+def test_least_important_sections_are_dropped_first():
+    # Every section is already as small as it gets, so one section must go
+    _, smallest = encode_match_prompt(_report(rotations=0), token_budget=0)
+    _, full_tokens = encode_match_prompt(_report(rotations=0), token_budget=10_000)
+    prompt, tokens = encode_match_prompt(_report(rotations=0), token_budget=full_tokens - 1)
+    assert smallest < tokens < full_tokens
+    assert "enemy_proximity:" not in prompt
+    assert "loadout" in prompt and "combat:" in prompt
+
+
+def test_over_budget_returns_minimal_prompt():
+    prompt, tokens = encode_match_prompt(_report(), token_budget=1)
+    assert tokens > 1
+    body = prompt[len(PROMPT_HEADER):-len(PROMPT_FOOTER)].strip()
+    assert body.startswith("summary:") and "\n" not in body
@@ -0,0 +1,111 @@
+# File: backend-python/tests/test_reanalyze.py
+
+import json
+
+from utils.AIAnalysis.match_analysis import ANALYZER_VERSIONS, analyze_events, run_match_analysis
+from utils.AIAnalysis.reanalyze import reanalyze_match, stale_modules
+
+EVENTS = [
+    {"type": "elimination", "player_id": "a"},
+    {"type": "damage", "player_id": "a", "amount": 40, "target": "enemy"},
+    {"type": "damage", "player_id": "b", "amount": 25, "target": "self"},
+]
+
+
+def _load(result_dir):
+    with open(result_dir / "analysis_full.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _store(result_dir, report):
+    with open(result_dir / "analysis_full.json", "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+def _stored_match(tmp_path, **parsed):
+    run_match_analysis({"events": EVENTS, **parsed}, str(tmp_path), generate_feedback=False)
+    return tmp_path
+
+
+def test_stale_modules():
+    assert stale_modules({"module_versions": dict(ANALYZER_VERSIONS)}) == []
+    assert stale_modules({"module_versions": {**ANALYZER_VERSIONS, "combat": 0}}) == ["combat"]
+    # Reports saved before versioning are fully stale
+    assert stale_modules({}) == list(ANALYZER_VERSIONS)
+
+
+def test_up_to_date_report_is_left_alone(tmp_path):
+    result_dir = _stored_match(tmp_path)
+    before = _load(result_dir)
+    assert reanalyze_match(result_dir) == []
+    assert _load(result_dir) == before
+
+
+def test_bumped_module_refreshes_its_section_and_summary(tmp_path, monkeypatch):
+    result_dir = _stored_match(tmp_path)
+    report = _load(result_dir)
+    report["analysis"]["combat"]["eliminations"] = 99
+    report["analysis"]["building"] = {"marker": True}
+    _store(result_dir, report)
+
+    monkeypatch.setitem(ANALYZER_VERSIONS, "combat", ANALYZER_VERSIONS["combat"] + 1)
+    assert reanalyze_match(result_dir) == ["combat", "summary"]
+
+    refreshed = _load(result_dir)
+    assert refreshed["analysis"]["combat"]["eliminations"] == 1
+    assert refreshed["analysis"]["summary"]["kills"] == 1
+    # Sections that are up to date are not recomputed
+    assert refreshed["analysis"]["building"] == {"marker": True}
+    assert refreshed["module_versions"]["combat"] == ANALYZER_VERSIONS["combat"]
+    assert refreshed["ai_feedback"] is None
+
+
+def test_force_recomputes_current_modules(tmp_path):
+    result_dir = _stored_match(tmp_path)
+    report = _load(result_dir)
+    report["analysis"]["combat"]["damage_given"] = 0
+    _store(result_dir, report)
+
+    assert reanalyze_match(result_dir, force=("combat", "unknown")) == ["combat", "summary"]
+    assert _load(result_dir)["analysis"]["combat"]["damage_given"] == 40
+
+
+def test_report_without_events_needs_reparse(tmp_path):
+    result_dir = _stored_match(tmp_path)
+    (result_dir / "events.json").unlink()
+    report = _load(result_dir)
+    del report["module_versions"]
+    _store(result_dir, report)
+
+    assert reanalyze_match(result_dir) == []
+    assert "module_versions" not in _load(result_dir)
+
+
+def test_players_rebuilt_from_player_events(tmp_path):
+    player_events = {
+        "p1": [{"type": "elimination"}, {"type": "elimination"}],
+        "p2": [{"type": "jump"}],
+    }
+    result_dir = _stored_match(tmp_path, player_events=player_events)
+    report = _load(result_dir)
+    report["players"]["rows"] = []
+    del report["module_versions"]
+    _store(result_dir, report)
+
+    reanalyze_match(result_dir)
+    players = _load(result_dir)["players"]
+    # The stored partition is used, not a re-partition of events.json (players "a" and "b")
+    assert [row[0] for row in players["rows"]] == ["p1", "p2"]
+    kills = players["columns"].index("kills")
+    assert players["rows"][0][kills] == analyze_events(player_events["p1"])["summary"]["kills"] == 2
+
+
+def test_players_repartitioned_without_player_events(tmp_path):
+    run_match_analysis({"events": EVENTS}, str(tmp_path), per_player=True, generate_feedback=False)
+    report = _load(tmp_path)
+    report["players"]["rows"] = []
+    del report["module_versions"]
+    _store(tmp_path, report)
+
+    reanalyze_match(tmp_path)
+    assert [row[0] for row in _load(tmp_path)["players"]["rows"]] == ["a", "b"]
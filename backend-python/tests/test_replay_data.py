@@ -0,0 +1,81 @@
+# File: backend-python/tests/test_replay_data.py
+
+import random
+
+import pytest
+
+from utils.fortnite_replay_parser.bitstream import BitReader, BitWriter
+from utils.fortnite_replay_parser.replay_data import (
+    MATERIALS,
+    PROP_DAMAGE,
+    PROPERTY_TYPE_BITS,
+    ReplayDataDecoder,
+    build_synthetic_payload,
+)
+
+
+def test_bits_round_trip():
+    writer = BitWriter()
+    writer.write_bit(1)
+    writer.write_bits(0b101, 3)
+    writer.write_bits(0x1234, 16)
+    writer.write_packed_int(300)
+    writer.write_int_max(2, 3)
+    writer.write_float(1.5)
+    writer.write_bytes(b"ok")
+    reader = BitReader(writer.getvalue())
+    assert reader.read_bit() == 1
+    assert reader.read_bits(3) == 0b101
+    assert reader.read_bits(16) == 0x1234
+    assert reader.read_packed_int() == 300
+    assert reader.read_int_max(3) == 2
+    assert reader.read_float() == 1.5
+    assert reader.read_bytes(2) == b"ok"
+
+
+def test_packed_vector_round_trip():
+    writer = BitWriter()
+    writer.write_packed_vector((12.3, -45.6, 7.0), 10, 24)
+    assert BitReader(writer.getvalue()).read_packed_vector(10, 24) == (12.3, -45.6, 7.0)
+
+
+def test_read_past_end_raises_value_error():
+    reader = BitReader(b"\x01")
+    reader.read_bits(8)
+    with pytest.raises(ValueError):
+        reader.read_bit()
+    with pytest.raises(ValueError):
+        BitReader(b"\xff\xff").read_packed_int()
+
+
+def test_decode_synthetic_payload():
+    decoder = ReplayDataDecoder()
+    assert decoder.decode(build_synthetic_payload(500, seed=3)) == 500
+    summary = decoder.summary()
+    assert sum(summary["records"].values()) == 500
+    assert summary["truncated_chunks"] == 0
+    assert len(decoder.positions) == 3 * len(decoder.position_handles)
+
+
+def test_oversized_damage_amount_stops_the_chunk():
+    writer = BitWriter()
+    writer.write_packed_int(1)
+    writer.write_bits(PROP_DAMAGE, PROPERTY_TYPE_BITS)
+    writer.write_packed_int(2)
+    writer.write_packed_int(1 << 40)
+    writer.write_bit(0)
+    decoder = ReplayDataDecoder()
+    assert decoder.decode(writer.getvalue()) == 0
+    assert decoder.truncated_chunks == 1
+    assert len(decoder.damage_handles) == len(decoder.damage_amounts) == 0
+
+
+def test_decode_random_payloads_never_raises():
+    rng = random.Random(0)
+    decoder = ReplayDataDecoder()
+    for _ in range(2000):
+        decoder.decode(rng.randbytes(rng.randrange(0, 512)))
+        assert len(decoder.damage_handles) == len(decoder.damage_targets) == len(decoder.damage_amounts)
+        assert len(decoder.positions) == 3 * len(decoder.position_handles)
+    assert sum(decoder.builds) * 3 == len(decoder.build_positions)
+    assert len(decoder.builds) == len(MATERIALS)
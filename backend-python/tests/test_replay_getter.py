@@ -0,0 +1,30 @@
+# File: backend-python/tests/test_replay_getter.py
+
+from utils import ReplayGetter
+from utils.pipeline_events import broadcaster
+
+
+class FakeParser:
+    def __init__(self, path):
+        self.path = path
+
+    def parse(self):
+        pass
+
+    def to_dict(self):
+        return {"events": [{"type": "elimination", "player_id": "a"}], "metadata": {}}
+
+
+def test_memory_pass_stores_and_publishes_nothing(tmp_path, monkeypatch):
+    published = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ReplayGetter, "ReplayParser", FakeParser)
+    monkeypatch.setattr(broadcaster, "publish", lambda *args, **kwargs: published.append(args))
+
+    report = ReplayGetter.analyze_without_saving(tmp_path / "match.replay")
+
+    assert report["analysis"]["summary"]["kills"] == 1
+    assert report["ai_feedback"] is None
+    assert "trajectory" in report
+    assert published == []
+    assert list(tmp_path.iterdir()) == []
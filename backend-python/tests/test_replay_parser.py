@@ -0,0 +1,70 @@
+# File: backend-python/tests/test_replay_parser.py
+
+import struct
+
+import pytest
+
+from utils.fortnite_replay_parser import CHUNK_HEADER_SIZE, HEADER_SIZE, ReplayParser
+
+
+def _chunk(chunk_type: int, time: int, data: bytes) -> bytes:
+    return struct.pack('<III', chunk_type, len(data), time) + data
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """Checkpoints at 20 and 50, one event text before, between and after them."""
+    chunks = [
+        _chunk(2, 10, b"Elimination PlayerId=a"),
+        _chunk(1, 20, b"CKPT"),
+        _chunk(2, 30, b"DamageDealt 40 PlayerId=a"),
+        _chunk(1, 50, b"CKPT"),
+        _chunk(2, 55, b"Jump PlayerId=b"),
+        _chunk(2, 70, b"Build Wood PlayerId=b"),
+    ]
+    path = tmp_path / "match.replay"
+    path.write_bytes(struct.pack('<8sII', b"FNREPLAY", 1, 2).ljust(HEADER_SIZE, b"\0") + b"".join(chunks))
+    return path
+
+
+def _offset_of(chunk_number: int) -> int:
+    sizes = [22, 4, 25, 4, 15]
+    return HEADER_SIZE + sum(CHUNK_HEADER_SIZE + size for size in sizes[:chunk_number])
+
+
+def test_build_checkpoint_index(replay):
+    parser = ReplayParser(str(replay))
+    assert parser.build_checkpoint_index() == [(20, _offset_of(1)), (50, _offset_of(3))]
+
+
+def test_full_parse_builds_the_same_index(replay):
+    parser = ReplayParser(str(replay))
+    parser.parse()
+    assert parser.checkpoint_index == ReplayParser(str(replay)).build_checkpoint_index()
+    assert len(parser.event_texts) == 4
+
+
+def test_seek_before_first_checkpoint_starts_at_first_chunk(replay):
+    parser = ReplayParser(str(replay))
+    assert parser.seek(5) == HEADER_SIZE
+    assert len(parser.event_texts) == 4
+
+
+def test_seek_exactly_on_checkpoint(replay):
+    parser = ReplayParser(str(replay))
+    assert parser.seek(50) == _offset_of(3)
+    assert parser.event_texts == ["Jump PlayerId=b", "Build Wood PlayerId=b"]
+
+
+def test_seek_between_checkpoints_drops_earlier_chunks(replay):
+    parser = ReplayParser(str(replay))
+    assert parser.seek(49) == _offset_of(1)
+    assert parser.event_texts[0] == "DamageDealt 40 PlayerId=a"
+    assert "Elimination PlayerId=a" not in parser.event_texts
+
+
+def test_seek_until_stops_after_time(replay):
+    parser = ReplayParser(str(replay))
+    parser.seek(20, until=55)
+    assert parser.event_texts == ["DamageDealt 40 PlayerId=a", "Jump PlayerId=b"]
+    assert parser.chunks[-1]["time"] == 55
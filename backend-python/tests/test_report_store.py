@@ -0,0 +1,41 @@
+# File: backend-python/tests/test_report_store.py
+
+import pytest
+
+from utils.report_store import etag_matches, parse_accept_encoding, save_artifact, select_variant
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = tmp_path / "analysis_full.json"
+    save_artifact(path, b'{"analysis": {}}' * 50)
+    (tmp_path / "analysis_full.json.br").write_bytes(b"br")
+    return path
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, deflate;q=0") == {"gzip": 1.0, "br": 0.5, "deflate": 0.0}
+    assert parse_accept_encoding(None) == {}
+
+
+def test_select_variant_prefers_server_order(artifact):
+    assert select_variant(artifact, "gzip, br")[1] == "br"
+
+
+def test_select_variant_follows_q_values(artifact):
+    assert select_variant(artifact, "gzip;q=1, br;q=0.5")[1] == "gzip"
+
+
+def test_select_variant_refuses_q_zero(artifact):
+    assert select_variant(artifact, "gzip;q=0") == (str(artifact), None, "")
+    assert select_variant(artifact, "*, br;q=0")[1] == "gzip"
+
+
+def test_select_variant_without_accept_encoding(artifact):
+    assert select_variant(artifact, "") == (str(artifact), None, "")
+
+
+def test_etag_matches_ignores_encoding_suffix():
+    assert etag_matches('W/"abc-gzip"', "abc")
+    assert etag_matches('"x", "abc"', "abc")
+    assert not etag_matches('"abd"', "abc")
@@ -0,0 +1,56 @@
+# File: backend-python/tests/test_rule_based.py
+
+from utils.AIAnalysis.feedback.rule_based import GENERIC_FEEDBACK, _metrics, generate_rule_feedback
+
+
+def test_empty_report_uses_defaults():
+    metrics = _metrics({})
+    assert metrics["eliminations"] == 0
+    assert metrics["heaviest_weapon"] is None
+    assert metrics["storm_exposure_pct"] == 0
+    # Only the no-eliminations rule applies to an empty report
+    assert generate_rule_feedback({}).startswith("Combat: No eliminations")
+
+
+def test_metrics_fall_back_to_summary():
+    report = {"analysis": {"summary": {"kills": 6, "accuracy": 45.0, "rotation_score": 60, "positioning_score": 80}}}
+    metrics = _metrics(report)
+    assert (metrics["eliminations"], metrics["accuracy"]) == (6, 45.0)
+    assert (metrics["rotation_score"], metrics["positioning_score"]) == (60, 80)
+
+
+def test_module_sections_win_over_summary():
+    report = {"analysis": {"combat": {"eliminations": 2}, "summary": {"kills": 6}}}
+    assert _metrics(report)["eliminations"] == 2
+
+
+def test_report_without_analysis_key_is_read_directly():
+    assert _metrics({"combat": {"eliminations": 3}})["eliminations"] == 3
+
+
+def test_heaviest_weapon_from_loadout_or_loadout_efficiency():
+    loadout = {"AR": {"damage": 120}, "Shotgun": {"damage": 300}}
+    assert _metrics({"loadout": loadout})["heaviest_weapon"] == "Shotgun"
+    assert _metrics({"loadout_efficiency": loadout})["heaviest_weapon"] == "Shotgun"
+    assert _metrics({"loadout": {"Pickaxe": {"damage": 0}}})["heaviest_weapon"] is None
+
+
+def test_feedback_lines_use_report_values():
+    report = {
+        "analysis": {
+            "combat": {"eliminations": 5, "accuracy": 12, "damage_given": 200, "damage_taken": 450},
+            "zone": {"storm_exposure_ratio": 0.35, "storm_damage_taken": 40},
+            "building": {"structures_built": 3},
+        }
+    }
+    lines = generate_rule_feedback(report).split("\n")
+    assert lines[0] == "Combat: 5 eliminations is a strong fragging game. Keep taking fights on your terms."
+    assert any("Accuracy was only 12%" in line for line in lines)
+    assert any("You took more damage (450) than you dealt (200)" in line for line in lines)
+    assert any(line.startswith("Zone: You spent 35% of zone time in the storm (40 storm damage)") for line in lines)
+    assert any(line.startswith("Building: Only 3 builds") for line in lines)
+
+
+def test_generic_feedback_when_no_rule_fires():
+    report = {"analysis": {"combat": {"eliminations": 2, "accuracy": 30}}}
+    assert generate_rule_feedback(report) == GENERIC_FEEDBACK
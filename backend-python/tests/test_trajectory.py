@@ -0,0 +1,79 @@
+# File: backend-python/tests/test_trajectory.py
+
+import math
+
+from utils.AIAnalysis.modules.movement import analyze_movement
+from utils.AIAnalysis.trajectory import _segment_distance, compress_movement_events, douglas_peucker
+
+
+def _track(player="a", samples=600, rate=30, mode="walk"):
+    events = []
+    x = y = 0.0
+    for i in range(samples):
+        angle = math.sin(i / 50)
+        x += math.cos(angle) * 0.5
+        y += math.sin(angle) * 0.5
+        events.append({
+            "type": "movement", "player_id": player, "time": i / rate, "position": [x, y, 0.0],
+            "distance": 0.5, "duration": 1 / rate, "mode": mode,
+        })
+    return events
+
+
+def test_segment_distance():
+    assert _segment_distance((1, 1), (0, 0), (2, 0)) == 1
+    assert _segment_distance((3, 0), (0, 0), (2, 0)) == 1
+    assert _segment_distance((1, 1), (0, 0), (0, 0)) == math.dist((1, 1), (0, 0))
+
+
+def test_douglas_peucker_drops_collinear_points():
+    points = [(i, 0) for i in range(10)]
+    assert douglas_peucker(points, 0.1) == [0, 9]
+
+
+def test_douglas_peucker_keeps_points_beyond_tolerance():
+    points = [(0, 0), (1, 0.05), (2, 3), (3, 0.05), (4, 0)]
+    assert douglas_peucker(points, 1.0) == [0, 2, 4]
+    assert douglas_peucker(points, 0.5) == [0, 1, 2, 3, 4]
+    assert douglas_peucker(points[:2], 0.5) == [0, 1]
+
+
+def test_dropped_points_stay_within_tolerance():
+    points = [(i, math.sin(i / 5) * 10) for i in range(200)]
+    kept = douglas_peucker(points, 0.5)
+    for a, b in zip(kept, kept[1:]):
+        for i in range(a + 1, b):
+            assert _segment_distance(points[i], points[a], points[b]) <= 0.5
+
+
+def test_compression_keeps_movement_totals():
+    events = _track(mode="walk") + _track(mode="sprint") + ["Jump"]
+    compressed, stats = compress_movement_events(events, tolerance=1.0, min_interval=0.25)
+    assert stats["points_in"] == 1200
+    assert stats["points_out"] < stats["points_in"] / 10
+    assert stats["max_path_length_error"] < 0.01
+    assert compressed[-1] == "Jump"
+
+    moves = [e for e in events if isinstance(e, dict)]
+    kept = [e for e in compressed if isinstance(e, dict)]
+    before, after = analyze_movement(moves), analyze_movement(kept)
+    assert after == before
+    assert sum(e.get("samples", 1) for e in kept) == len(moves)
+
+
+def test_compression_splits_tracks_per_player_and_mode():
+    events = _track("a", 10, mode="walk") + _track("a", 10, mode="sprint") + _track("b", 10)
+    compressed, stats = compress_movement_events(events, tolerance=100.0, min_interval=0)
+    # Each of the three runs keeps its first and last sample
+    assert stats["points_out"] == 6
+    assert {(e["player_id"], e["mode"]) for e in compressed} == {("a", "walk"), ("a", "sprint"), ("b", "walk")}
+
+
+def test_compression_is_idempotent_and_leaves_input_untouched():
+    events = _track()
+    original = [dict(e) for e in events]
+    compressed, _ = compress_movement_events(events)
+    again, stats = compress_movement_events(compressed)
+    assert events == original
+    assert again == compressed
+    assert stats["points_in"] == stats["points_out"]
@@ -0,0 +1,56 @@
+# File: backend-python/tests/test_work_queue.py
+
+import pytest
+
+from utils.work_queue import SQLiteWorkQueue, WorkQueue
+
+
+@pytest.fixture
+def replays(tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.replay"
+        path.write_bytes(name.encode() * 64)
+        paths.append(path)
+    return paths
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        WorkQueue()
+
+
+def test_enqueue_is_idempotent(tmp_path, replays):
+    queue = SQLiteWorkQueue(tmp_path / "q.sqlite")
+    assert queue.enqueue(replays[0]) == queue.enqueue(replays[0])
+    assert queue.stats() == {"queued": 1}
+
+
+def test_lease_complete_and_stale_token(tmp_path, replays):
+    queue = SQLiteWorkQueue(tmp_path / "q.sqlite")
+    queue.enqueue(replays[0])
+    lease = queue.lease("w1")
+    assert lease.attempts == 1
+    assert queue.lease("w2") is None
+    assert queue.complete(lease)
+    assert not queue.complete(lease)
+    assert queue.stats() == {"done": 1}
+
+
+def test_expired_last_attempt_fails_and_next_job_is_leased(tmp_path, replays):
+    queue = SQLiteWorkQueue(tmp_path / "q.sqlite", max_attempts=1)
+    queue.enqueue(replays[0])
+    assert queue.lease("w1", lease_seconds=-1) is not None
+    queue.enqueue(replays[1])
+    lease = queue.lease("w2")
+    assert lease.path == str(replays[1])
+    assert queue.stats() == {"failed": 1, "leased": 1}
+
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path, replays):
+    queue = SQLiteWorkQueue(tmp_path / "q.sqlite", max_attempts=2)
+    queue.enqueue(replays[0])
+    assert queue.fail(queue.lease("w1"), "boom")
+    assert queue.fail(queue.lease("w1"), "boom")
+    assert queue.lease("w1") is None
+    assert queue.stats() == {"failed": 1}
@@ -1,27 +1,104 @@
 # File: backend-python/utils/AIAnalysis/feedback/llm_assistant.py
 
-from openai import OpenAI
+import os
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator
 
-# Correct relative path
-api_key_path = "H:\\git\\Fortnite-Analyser\\backend-python\\utils\\AIAnalysis\\feedback\\.config.json"
+from utils.report_store import store_feedback
+from utils.AIAnalysis.feedback.prompt_encoder import encode_match_prompt, DEFAULT_TOKEN_BUDGET
+from utils.AIAnalysis.feedback.rule_based import generate_rule_feedback
 
-with open(api_key_path, "r") as f:
-    api_key = json.load(f).get("api_key")
+# Set LLM_STUB_DELAY (seconds per token) to use the local stub instead of OpenAI
+stub_delay = os.getenv("LLM_STUB_DELAY")
 
-client = OpenAI(api_key=api_key)
+# Seconds before an OpenAI request is abandoned, so hung calls free their worker
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 30))
+
+if stub_delay is not None:
+    from utils.AIAnalysis.feedback.stub_client import StubStreamingClient
+    client = StubStreamingClient(delay=float(stub_delay))
+else:
+    from openai import OpenAI
+
+    # Correct relative path
+    api_key_path = "H:\\git\\Fortnite-Analyser\\backend-python\\utils\\AIAnalysis\\feedback\\.config.json"
+
+    with open(api_key_path, "r") as f:
+        api_key = json.load(f).get("api_key")
+
+    client = OpenAI(api_key=api_key, timeout=LLM_REQUEST_TIMEOUT, max_retries=0)
 
 
 # Create training output dir
 TRAINING_DATA_DIR = Path("training_data")
 TRAINING_DATA_DIR.mkdir(exist_ok=True)
 
+SYSTEM_PROMPT = "You are a Fortnite coach providing tactical gameplay feedback."
+
+# Estimated prompt token budget per feedback call
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+# Seconds the LLM gets before rule-based feedback is served instead
+FEEDBACK_DEADLINE = float(os.getenv("FEEDBACK_DEADLINE", 8))
+
+# LLM calls run here so a call that misses its deadline never blocks the caller
+_llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-feedback")
+
+
+def start_ai_feedback(match_report: dict, deadline: float = FEEDBACK_DEADLINE):
+    """
+    Return rule-based feedback right away and race the LLM against `deadline` in
+    the background. Returns (feedback, llm_feedback): llm_feedback is a Future that
+    resolves to the LLM answer if it arrived in time, else None (or is None itself
+    when the deadline is 0). A call still queued at the deadline is cancelled;
+    a late answer is still saved for training.
+    """
+    local_feedback = generate_rule_feedback(match_report)
+    if deadline <= 0:
+        return local_feedback, None
+
+    expires = time.monotonic() + deadline
+    llm_feedback = Future()
+    future = _llm_executor.submit(request_llm_feedback, match_report)
+    timer = threading.Timer(deadline, future.cancel)
+    timer.daemon = True
+
+    def settle(f):
+        timer.cancel()
+        feedback = None if f.cancelled() else f.result()
+        if feedback and time.monotonic() > expires:
+            print(f"⏱️ LLM missed the {deadline}s deadline, keeping rule-based feedback.")
+            feedback = None
+        llm_feedback.set_result(feedback)
+
+    timer.start()
+    future.add_done_callback(settle)
+    return local_feedback, llm_feedback
+
+
+def generate_ai_feedback(match_report: dict, deadline: float = FEEDBACK_DEADLINE) -> str:
+    """
+    Get coaching feedback for a match within `deadline` seconds: the LLM answer
+    if it arrives in time, otherwise the rule-based feedback.
+    """
+    local_feedback, llm_feedback = start_ai_feedback(match_report, deadline)
+    if llm_feedback is None:
+        return local_feedback
+    try:
+        return llm_feedback.result(timeout=deadline) or local_feedback
+    except FutureTimeout:
+        return local_feedback
+
 
-def generate_ai_feedback(match_report: dict) -> str:
+def request_llm_feedback(match_report: dict):
     """
     Send structured match data to GPT and receive high-level coaching feedback.
+    Returns None if the LLM call fails.
     """
     prompt = build_prompt_from_match(match_report)
 
@@ -30,7 +107,7 @@ def generate_ai_feedback(match_report: dict) -> str:
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
-                {"role": "system", "content": "You are a Fortnite coach providing tactical gameplay feedback."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
@@ -44,48 +121,71 @@ def generate_ai_feedback(match_report: dict) -> str:
 
     except Exception as e:
         print(f"❌ LLM feedback error: {e}")
-        return "Unable to generate feedback at this time."
+        return None
 
 
-def build_prompt_from_match(report: dict) -> str:
+def stream_ai_feedback(match_report: dict) -> Iterator[str]:
     """
-    Turn structured JSON match data into a coaching-friendly prompt.
+    Like generate_ai_feedback, but yields the completion text as tokens arrive.
+    If the LLM fails before any token, the rule-based feedback is yielded instead;
+    a failure mid-stream is re-raised so callers never mistake partial text for complete.
     """
-    summary = report.get("summary", {})
-    combat = report.get("combat", {})
-    rotation = report.get("rotation", {})
-    loadout = report.get("loadout_efficiency", {})
-    position = report.get("positioning", {})
-    proximity = report.get("enemy_proximity", {})
+    prompt = build_prompt_from_match(match_report)
+    parts = []
 
-    prompt = f"""Here's a summary of a player's Fortnite match. Please provide personalized tactical feedback, including positioning, combat decisions, loadout usage, and rotation quality.
+    try:
+        print("🧠 Streaming feedback from LLM...")
+        stream = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.5,
+            max_tokens=800,
+            stream=True
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if token:
+                parts.append(token)
+                yield token
 
-MATCH SUMMARY:
-- Kills: {summary.get('kills', 0)}
-- Accuracy: {summary.get('accuracy', 0.0)}%
-- Positioning Score: {summary.get('positioning_score', 0)}
-- Rotation Score: {summary.get('rotation_score', 0)}
-- Zone Safety Time: {summary.get('zone_safety', 0)} seconds
-- Average Enemy Distance: {proximity.get('avg_distance', 0.0)} meters
-- Weapons Used: {', '.join(loadout.keys()) if loadout else 'N/A'}
+    except Exception as e:
+        print(f"❌ LLM feedback error: {e}")
+        if parts:
+            raise
+        yield generate_rule_feedback(match_report)
+        return
 
-COMBAT:
-{json.dumps(combat, indent=2)}
+    print("✅ Feedback stream complete.")
+    save_for_training(prompt, "".join(parts).strip())
 
-ROTATION:
-{json.dumps(rotation, indent=2)}
 
-POSITIONING:
-{json.dumps(position, indent=2)}
+def stream_feedback_to_report(match_report: dict, result_dir) -> Iterator[str]:
+    """
+    Forward streamed feedback to the caller, then store the complete text in the
+    report in result_dir (analysis_full.json, feedback.txt, feedback.json), each
+    written atomically so readers never see a partial file.
+    Nothing is saved if the stream fails part way.
+    """
+    parts = []
+    for token in stream_ai_feedback(match_report):
+        parts.append(token)
+        yield token
 
-LOADOUT EFFICIENCY:
-{json.dumps(loadout, indent=2)}
+    store_feedback(result_dir, match_report, "".join(parts).strip())
+    print(f"✅ Saved streamed feedback to {result_dir}")
 
-ENEMY PROXIMITY:
-{json.dumps(proximity, indent=2)}
 
-Please keep your feedback concise but informative.
-"""
+def build_prompt_from_match(report: dict, token_budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """
+    Turn structured JSON match data into a compact coaching prompt within token_budget.
+    """
+    prompt, tokens = encode_match_prompt(report, token_budget)
+    print(f"📏 Prompt size: ~{tokens} tokens (budget {token_budget})")
     return prompt
 
 
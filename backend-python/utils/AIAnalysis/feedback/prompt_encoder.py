@@ -0,0 +1,141 @@
+# File: backend-python/utils/AIAnalysis/feedback/prompt_encoder.py
+
+import math
+import re
+from typing import Tuple
+
+DEFAULT_TOKEN_BUDGET = 600
+
+PROMPT_HEADER = (
+    "Here's a summary of a player's Fortnite match. Please provide personalized tactical feedback, "
+    "including positioning, combat decisions, loadout usage, and rotation quality.\n"
+    "Sections are compact: 'key=value' pairs, tables as 'name[col|col]: row; row', "
+    "long lists as count and mean/min/max stats.\n"
+)
+PROMPT_FOOTER = "Please keep your feedback concise but informative.\n"
+
+# Detail sections, most important first. The last ones are dropped first when over budget.
+SECTION_ORDER = ("combat", "rotation", "positioning", "loadout", "enemy_proximity")
+
+# Rows kept per table before a list is summarized statistically, tried in order
+ROW_LIMITS = (20, 10, 5, 0)
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local approximation of BPE token count: one token per punctuation mark and
+    per ~4 characters of each word.
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    if isinstance(value, (list, tuple)):
+        return "/".join(_fmt(v) for v in value)
+    if isinstance(value, dict):
+        return ",".join(f"{k}={_fmt(v)}" for k, v in value.items())
+    return str(value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _encode_table(name: str, rows: list, max_rows: int) -> str:
+    """Encode a list of dicts as a table, or as column stats if it is too long."""
+    columns = list(rows[0].keys())
+
+    if len(rows) <= max_rows:
+        body = "; ".join("|".join(_fmt(row.get(c)) for c in columns) for row in rows)
+        return f"{name}[{'|'.join(columns)}]: {body}"
+
+    stats = []
+    for column in columns:
+        values = [row.get(column) for row in rows if _is_number(row.get(column))]
+        if values:
+            stats.append(
+                f"{column}=mean {_fmt(sum(values) / len(values))} "
+                f"min {_fmt(min(values))} max {_fmt(max(values))}"
+            )
+    return f"{name}: n={len(rows)} " + " ".join(stats)
+
+
+def encode_section(name: str, data, max_rows: int = ROW_LIMITS[0]) -> str:
+    """
+    Encode one analysis section compactly. Scalars become key=value pairs,
+    lists of records and dicts of records become tables.
+    """
+    if not data:
+        return f"{name}: none"
+
+    if isinstance(data, list):
+        if all(isinstance(row, dict) for row in data):
+            return _encode_table(name, data, max_rows)
+        return f"{name}: {_fmt(data)}"
+
+    if not isinstance(data, dict):
+        return f"{name}: {_fmt(data)}"
+
+    # Dict of records (e.g. loadout: item -> {uses, damage})
+    if all(isinstance(v, dict) for v in data.values()):
+        return _encode_table(name, [{"name": k, **v} for k, v in data.items()], max_rows)
+
+    scalars = []
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+            lines.append(_encode_table(f"{name}.{key}", value, max_rows))
+        else:
+            scalars.append(f"{key}={_fmt(value)}")
+
+    return "\n".join([f"{name}: " + " ".join(scalars)] + lines)
+
+
+def encode_match_prompt(report: dict, token_budget: int = DEFAULT_TOKEN_BUDGET) -> Tuple[str, int]:
+    """
+    Build the coaching prompt within token_budget (estimated).
+    Long lists are summarized first, then the least important sections are dropped;
+    if even the summary alone is over budget, that minimal prompt is returned.
+    Returns (prompt, estimated_tokens).
+    """
+    analysis = report.get("analysis", report)
+    summary = analysis.get("summary", {})
+    loadout = analysis.get("loadout", analysis.get("loadout_efficiency", {}))
+    proximity = analysis.get("enemy_proximity", {})
+
+    overview = encode_section("summary", {
+        "kills": summary.get("kills", 0),
+        "accuracy_pct": summary.get("accuracy", 0.0),
+        "positioning_score": summary.get("positioning_score", 0),
+        "rotation_score": summary.get("rotation_score", 0),
+        "zone_safety_s": summary.get("zone_safety", 0),
+        "avg_enemy_distance_m": proximity.get("avg_distance", 0.0),
+        "weapons": ",".join(str(k) for k in loadout.keys()) if loadout else "N/A",
+    })
+
+    sections = {name: analysis.get(name, {}) for name in SECTION_ORDER}
+    sections["loadout"] = loadout
+
+    def render(names, max_rows):
+        body = [overview] + [encode_section(n, sections[n], max_rows) for n in names]
+        return PROMPT_HEADER + "\n" + "\n".join(body) + "\n\n" + PROMPT_FOOTER
+
+    names = list(SECTION_ORDER)
+    for max_rows in ROW_LIMITS:
+        prompt = render(names, max_rows)
+        tokens = estimate_tokens(prompt)
+        if tokens <= token_budget:
+            return prompt, tokens
+
+    while names:
+        names.pop()
+        prompt = render(names, 0)
+        tokens = estimate_tokens(prompt)
+        if tokens <= token_budget:
+            break
+
+    return prompt, tokens
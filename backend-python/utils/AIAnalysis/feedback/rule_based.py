@@ -0,0 +1,85 @@
+# File: backend-python/utils/AIAnalysis/feedback/rule_based.py
+
+# Coaching rules over the analysis report: (category, condition, template).
+# Conditions and templates read a flat metrics dict such as {"accuracy": 31.5, "storm_exposure_ratio": 0.2}.
+RULES = [
+    ("Combat", lambda m: m["eliminations"] == 0,
+     "No eliminations this match. Look for third-party opportunities on weakened players instead of avoiding every fight."),
+    ("Combat", lambda m: m["eliminations"] >= 5,
+     "{eliminations} eliminations is a strong fragging game. Keep taking fights on your terms."),
+    ("Combat", lambda m: 0 < m["accuracy"] < 20,
+     "Accuracy was only {accuracy}%. Take fewer long-range spray shots and commit to closer, higher-percentage engagements."),
+    ("Combat", lambda m: m["accuracy"] >= 40,
+     "Accuracy of {accuracy}% is excellent. Your aim is not the bottleneck."),
+    ("Combat", lambda m: m["damage_taken"] > m["damage_given"] > 0,
+     "You took more damage ({damage_taken}) than you dealt ({damage_given}). Disengage earlier and heal up before re-peeking."),
+    ("Rotation", lambda m: m["avg_rotation_distance"] > 100,
+     "Zones moved an average of {avg_rotation_distance}m. Start rotating as soon as the next circle is shown to avoid long late runs."),
+    ("Rotation", lambda m: 0 < m["rotation_score"] < 80,
+     "Rotation score of {rotation_score} suggests slow or late moves. Use vehicles, launch pads or ziplines on long rotations."),
+    ("Positioning", lambda m: m["positioning_total"] and m["positioning_score"] < 50,
+     "Positioning score of {positioning_score}: you spent much of the match exposed. Fight from cover and take high ground before engaging."),
+    ("Positioning", lambda m: m["positioning_score"] >= 75,
+     "Positioning score of {positioning_score} shows good use of cover and high ground."),
+    ("Zone", lambda m: m["storm_exposure_ratio"] > 0.2,
+     "You spent {storm_exposure_pct}% of zone time in the storm ({storm_damage_taken} storm damage). Rotate earlier to stay ahead of it."),
+    ("Proximity", lambda m: m["encounters"] and m["close_encounters"] / m["encounters"] > 0.5,
+     "Most enemy encounters ({close_encounters}/{encounters}) were at close range. Make sure your loadout has a strong close-range option."),
+    ("Building", lambda m: m["structures_built"] < 10 and m["damage_taken"] > 100,
+     "Only {structures_built} builds while taking {damage_taken} damage. Build cover as soon as you are shot at."),
+    ("Loadout", lambda m: m["heaviest_weapon"] is not None,
+     "Most of your damage came from {heaviest_weapon}. Keep it in your loadout and practise with your other slots."),
+]
+
+GENERIC_FEEDBACK = "Steady match with no major issues flagged. Keep focusing on early rotations and fighting from cover."
+
+
+def _metrics(report: dict) -> dict:
+    analysis = report.get("analysis", report)
+    combat = analysis.get("combat", {})
+    rotation = analysis.get("rotation", {})
+    positioning = analysis.get("positioning", {})
+    zone = analysis.get("zone", {})
+    proximity = analysis.get("enemy_proximity", {})
+    building = analysis.get("building", {})
+    loadout = analysis.get("loadout", analysis.get("loadout_efficiency", {}))
+    summary = analysis.get("summary", {})
+
+    heaviest_weapon = None
+    if loadout:
+        weapon, stats = max(loadout.items(), key=lambda item: item[1].get("damage", 0))
+        if stats.get("damage", 0) > 0:
+            heaviest_weapon = weapon
+
+    storm_ratio = zone.get("storm_exposure_ratio", 0.0)
+    return {
+        "eliminations": combat.get("eliminations", summary.get("kills", 0)),
+        "accuracy": combat.get("accuracy", summary.get("accuracy", 0.0)),
+        "damage_given": combat.get("damage_given", 0),
+        "damage_taken": combat.get("damage_taken", 0),
+        "avg_rotation_distance": rotation.get("avg_rotation_distance", 0.0),
+        "rotation_score": rotation.get("score", summary.get("rotation_score", 0)),
+        "positioning_score": positioning.get("score", summary.get("positioning_score", 0)),
+        "positioning_total": sum(positioning.get(k, 0) for k in ("time_in_cover", "time_in_open", "time_on_high_ground", "exposed_time")),
+        "storm_exposure_ratio": storm_ratio,
+        "storm_exposure_pct": round(storm_ratio * 100),
+        "storm_damage_taken": zone.get("storm_damage_taken", 0),
+        "encounters": proximity.get("encounters", 0),
+        "close_encounters": proximity.get("close_encounters", 0),
+        "structures_built": building.get("structures_built", 0),
+        "heaviest_weapon": heaviest_weapon,
+    }
+
+
+def generate_rule_feedback(report: dict) -> str:
+    """
+    Build coaching feedback locally from the analysis report using RULES.
+    Used when the LLM is slow or unavailable.
+    """
+    metrics = _metrics(report)
+    lines = [
+        f"{category}: {template.format(**metrics)}"
+        for category, condition, template in RULES
+        if condition(metrics)
+    ]
+    return "\n".join(lines) if lines else GENERIC_FEEDBACK
@@ -0,0 +1,38 @@
+# File: backend-python/utils/AIAnalysis/feedback/stub_client.py
+
+import time
+from types import SimpleNamespace
+
+DEFAULT_FEEDBACK = (
+    "Solid match overall. Rotate earlier when the next zone is announced so you are not "
+    "fighting from the storm edge. Take high ground before engaging, and keep a heal "
+    "in your loadout for late-game fights."
+)
+
+
+class StubStreamingClient:
+    """
+    Local stand-in for the OpenAI client. chat.completions.create() emits the
+    canned feedback word by word, sleeping `delay` seconds between tokens.
+    """
+
+    def __init__(self, text: str = DEFAULT_FEEDBACK, delay: float = 0.05):
+        self.text = text
+        self.delay = delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _tokens(self):
+        words = self.text.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.delay)
+            yield word if i == 0 else " " + word
+
+    def _create(self, stream: bool = False, **kwargs):
+        if stream:
+            return (
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+                for token in self._tokens()
+            )
+
+        content = "".join(self._tokens())
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
@@ -1,76 +1,185 @@
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 
-from utils.AIAnalysis.modules.combat import analyze_combat
-from utils.AIAnalysis.modules.movement import analyze_movement
-from utils.AIAnalysis.modules.positioning import analyze_positioning
-from utils.AIAnalysis.modules.rotation import analyze_rotation
-from utils.AIAnalysis.modules.zone import analyze_zone_safety
-from utils.AIAnalysis.modules.loadout_efficiency import analyze_loadout_efficiency
-from utils.AIAnalysis.modules.enemy_proximity import analyze_enemy_proximity
-from utils.AIAnalysis.modules.building import analyze_building
-from utils.AIAnalysis.modules.summary import generate_match_summary
+from utils.AIAnalysis.modules.combat import analyze_combat, ANALYZER_VERSION as COMBAT_VERSION
+from utils.AIAnalysis.modules.movement import analyze_movement, ANALYZER_VERSION as MOVEMENT_VERSION
+from utils.AIAnalysis.modules.positioning import analyze_positioning, ANALYZER_VERSION as POSITIONING_VERSION
+from utils.AIAnalysis.modules.rotation import analyze_rotation, ANALYZER_VERSION as ROTATION_VERSION
+from utils.AIAnalysis.modules.zone import analyze_zone_safety, ANALYZER_VERSION as ZONE_VERSION
+from utils.AIAnalysis.modules.loadout_efficiency import analyze_loadout_efficiency, ANALYZER_VERSION as LOADOUT_VERSION
+from utils.AIAnalysis.modules.enemy_proximity import analyze_enemy_proximity, ANALYZER_VERSION as PROXIMITY_VERSION
+from utils.AIAnalysis.modules.building import analyze_building, ANALYZER_VERSION as BUILDING_VERSION
+from utils.AIAnalysis.modules.summary import generate_match_summary, ANALYZER_VERSION as SUMMARY_VERSION
 
-from utils.AIAnalysis.feedback.llm_assistant import generate_ai_feedback
+from utils.AIAnalysis.feedback.llm_assistant import start_ai_feedback
+from utils.report_store import save_feedback, save_json_artifact, store_feedback
+from utils.fortnite_replay_parser.normalizer import normalize_events
 
+# Analysis modules in report order: section name -> analyzer
+ANALYZERS = {
+    "combat": analyze_combat,
+    "movement": analyze_movement,
+    "positioning": analyze_positioning,
+    "rotation": analyze_rotation,
+    "zone": analyze_zone_safety,
+    "loadout": analyze_loadout_efficiency,
+    "enemy_proximity": analyze_enemy_proximity,
+    "building": analyze_building,
+}
 
-def run_match_analysis(parsed_replay: dict, output_dir: str) -> dict:
+# Each module's ANALYZER_VERSION is recorded in saved reports; bumping one makes
+# `python -m utils.AIAnalysis.reanalyze` recompute that section for stored matches.
+ANALYZER_VERSIONS = {
+    "combat": COMBAT_VERSION,
+    "movement": MOVEMENT_VERSION,
+    "positioning": POSITIONING_VERSION,
+    "rotation": ROTATION_VERSION,
+    "zone": ZONE_VERSION,
+    "loadout": LOADOUT_VERSION,
+    "enemy_proximity": PROXIMITY_VERSION,
+    "building": BUILDING_VERSION,
+    "summary": SUMMARY_VERSION,
+}
+
+PLAYER_ID_KEY = "player_id"
+
+
+def analyze_events(events) -> dict:
+    """
+    Run every analysis module over one player's event stream and summarize it.
+    """
+    results = {name: analyzer(events) for name, analyzer in ANALYZERS.items()}
+    results["summary"] = generate_match_summary(results)
+    return results
+
+
+def partition_events_by_player(events, key: str = PLAYER_ID_KEY) -> dict:
+    """
+    Group a lobby-wide event stream by player id in a single pass.
+    Events without a player id (zone changes, storm, etc.) are shared by every player.
+    """
+    partitions = {}
+    shared = []
+
+    for event in events:
+        player_id = event.get(key)
+        if player_id is None:
+            shared.append(event)
+            for player_events in partitions.values():
+                player_events.append(event)
+            continue
+
+        player_events = partitions.get(player_id)
+        if player_events is None:
+            # Late joiners still need the shared events seen so far
+            player_events = partitions[player_id] = list(shared)
+        player_events.append(event)
+
+    return partitions
+
+
+def _analyze_player_batch(batch):
+    return [(player_id, analyze_events(events)["summary"]) for player_id, events in batch]
+
+
+def run_lobby_analysis(events_by_player: dict, workers: int = None) -> dict:
+    """
+    Analyze every player in a replay and return a compact per-player table:
+    {"columns": [...], "rows": [[player_id, ...], ...]}.
+    With workers > 1 the players are split into batches across worker processes.
+    """
+    items = list(events_by_player.items())
+
+    if workers and workers > 1 and len(items) > 1:
+        batch_size = -(-len(items) // workers)
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [row for batch in executor.map(_analyze_player_batch, batches) for row in batch]
+    else:
+        results = _analyze_player_batch(items)
+
+    columns = [PLAYER_ID_KEY]
+    if results:
+        columns += list(results[0][1].keys())
+
+    return {
+        "columns": columns,
+        "rows": [[player_id, *summary.values()] for player_id, summary in results],
+    }
+
+
+def _store_llm_feedback(output_dir: str, report: dict, feedback: str, on_llm_feedback=None):
+    """Replace the stored rule-based feedback with the LLM answer."""
+    report = store_feedback(output_dir, report, feedback)
+    print(f"✅ LLM feedback replaced rule-based feedback in {output_dir}")
+    if on_llm_feedback is not None:
+        on_llm_feedback(report)
+
+
+def run_match_analysis(parsed_replay: dict, output_dir: str, per_player: bool = False, workers: int = None,
+                       generate_feedback: bool = True, on_llm_feedback=None) -> dict:
     """
     Orchestrate full analysis from parsed replay.
-    Saves analysis report and AI feedback in output_dir.
+    Saves analysis report and AI feedback (unless generate_feedback is False) in output_dir.
+    The report is saved with rule-based feedback at once; if the LLM answers before
+    the feedback deadline, its answer replaces it and on_llm_feedback(report) is called
+    with the updated report.
+
+    If the replay carries a "player_events" partition, or per_player is set, every
+    player in the lobby is also analyzed and added to the report as a "players" table.
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    events = parsed_replay.get("events", [])
+    raw_events = parsed_replay.get("events", [])
+    events = normalize_events(raw_events)
     metadata = parsed_replay.get("metadata", {})
 
     # Run analysis modules
-    combat = analyze_combat(events)
-    movement = analyze_movement(events)
-    positioning = analyze_positioning(events)
-    rotation = analyze_rotation(events)
-    zone = analyze_zone_safety(events)
-    loadout = analyze_loadout_efficiency(events)
-    proximity = analyze_enemy_proximity(events)
-    building = analyze_building(events)
-
-    # Summary
-    summary = generate_match_summary({
-        "combat": combat,
-        "movement": movement,
-        "positioning": positioning,
-        "rotation": rotation,
-        "zone": zone,
-        "loadout": loadout,
-        "enemy_proximity": proximity,
-        "building": building,
-    })
+    analysis = analyze_events(events)
 
     # Compile full report
     full_report = {
         "metadata": metadata,
-        "analysis": {
-            "combat": combat,
-            "movement": movement,
-            "positioning": positioning,
-            "rotation": rotation,
-            "zone": zone,
-            "loadout": loadout,
-            "enemy_proximity": proximity,
-            "building": building,
-            "summary": summary,
-        }
+        "module_versions": dict(ANALYZER_VERSIONS),
+        "analysis": analysis,
     }
 
+    # Per-player lobby table
+    raw_events_by_player = parsed_replay.get("player_events")
+    events_by_player = None
+    if raw_events_by_player is not None:
+        events_by_player = {pid: normalize_events(evs) for pid, evs in raw_events_by_player.items()}
+    elif per_player:
+        events_by_player = partition_events_by_player(events)
+    if events_by_player:
+        full_report["players"] = run_lobby_analysis(events_by_player, workers)
+
+    # Movement compression applied at ingest (tolerance and measured error)
+    if "trajectory" in parsed_replay:
+        full_report["trajectory"] = parsed_replay["trajectory"]
+
     # Generate AI feedback
-    feedback = generate_ai_feedback(full_report)
+    feedback, llm_feedback = start_ai_feedback(full_report) if generate_feedback else (None, None)
     full_report["ai_feedback"] = feedback
 
-    # Save outputs
-    with open(os.path.join(output_dir, "analysis_full.json"), "w", encoding="utf-8") as f:
-        json.dump(full_report, f, indent=2)
+    # Save outputs (compact, with precompressed variants for serving)
+    save_json_artifact(os.path.join(output_dir, "analysis_full.json"), full_report)
+
+    # Parsed events are kept so changed modules can be re-run without reparsing
+    with open(os.path.join(output_dir, "events.json"), "w", encoding="utf-8") as f:
+        json.dump(raw_events, f, separators=(",", ":"))
+    if raw_events_by_player is not None:
+        with open(os.path.join(output_dir, "player_events.json"), "w", encoding="utf-8") as f:
+            json.dump(raw_events_by_player, f, separators=(",", ":"))
+
+    if feedback is not None:
+        save_feedback(output_dir, feedback)
 
-    with open(os.path.join(output_dir, "feedback.txt"), "w", encoding="utf-8") as f:
-        f.write(feedback)
+    # Registered after saving so a fast LLM answer cannot be overwritten by the local one
+    if llm_feedback is not None:
+        llm_feedback.add_done_callback(
+            lambda f: f.result() and _store_llm_feedback(output_dir, full_report, f.result(), on_llm_feedback)
+        )
 
     return full_report
@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/building.py
 
+ANALYZER_VERSION = 1
+
 def analyze_building(events):
     """
     Analyze player's building efficiency and patterns.
@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/combat.py
 
+ANALYZER_VERSION = 1
+
 def analyze_combat(events):
     """
     Analyze combat-related events such as eliminations, hits, damage taken/given.
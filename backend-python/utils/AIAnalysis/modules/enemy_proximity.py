@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/enemy_proximity.py
 
+ANALYZER_VERSION = 1
+
 def analyze_enemy_proximity(events):
     """
     Analyze how often and how close enemies were during the match.
@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/inventory.py
 
+ANALYZER_VERSION = 1
+
 def analyze_inventory(events):
     """
     Analyze inventory usage over the match.
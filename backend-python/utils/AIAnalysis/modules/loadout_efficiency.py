@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/loadout_efficiency.py
 
+ANALYZER_VERSION = 1
+
 def analyze_loadout_efficiency(events):
     """
     Evaluate the usage and impact of each item used.
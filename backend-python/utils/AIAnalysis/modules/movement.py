@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/movement.py
 
+ANALYZER_VERSION = 1
+
 def analyze_movement(events):
     """
     Analyze player movement during the match.
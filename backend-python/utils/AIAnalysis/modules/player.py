@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/player.py
 
+ANALYZER_VERSION = 1
+
 def analyze_player(events):
     """
     Analyze player-level performance such as survival, health status, and placement.
@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/positioning.py
 
+ANALYZER_VERSION = 1
+
 def analyze_positioning(events):
     """
     Analyze player positioning quality based on elevation, cover, and exposure.
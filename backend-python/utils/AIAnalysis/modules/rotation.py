@@ -1,5 +1,9 @@
+# File: backend-python/utils/AIAnalysis/modules/rotation.py
+
 from math import dist
 
+ANALYZER_VERSION = 2
+
 def analyze_rotation(events):
     """
     Analyze how the player rotates between safe zones.
@@ -48,7 +52,9 @@ def analyze_rotation(events):
             if last_pos and pos:
                 total_distance += dist(last_pos, pos)
             last_pos = pos
-        avg_rotation_speed = round(total_distance / len(movement_during_zone), 2)
+        # Compressed movement events stand in for `samples` raw ones
+        samples = sum(move.get("samples", 1) for move in movement_during_zone)
+        avg_rotation_speed = round(total_distance / samples, 2)
 
     # Simple scoring logic (for early model training and UI)
     score = 100
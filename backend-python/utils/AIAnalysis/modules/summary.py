@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/summary.py
 
+ANALYZER_VERSION = 1
+
 def generate_match_summary(analysis_results):
     """
     Summarize analysis across all modules.
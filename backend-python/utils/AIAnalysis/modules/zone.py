@@ -1,5 +1,7 @@
 # File: backend-python/utils/AIAnalysis/modules/zone.py
 
+ANALYZER_VERSION = 1
+
 def analyze_zone_safety(events):
     """
     Analyze player zone behavior including storm time and safe zone entries.
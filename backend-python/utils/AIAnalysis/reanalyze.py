@@ -0,0 +1,104 @@
+# File: backend-python/utils/AIAnalysis/reanalyze.py
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.AIAnalysis.match_analysis import (
+    ANALYZERS,
+    ANALYZER_VERSIONS,
+    partition_events_by_player,
+    run_lobby_analysis,
+)
+from utils.AIAnalysis.modules.summary import generate_match_summary
+from utils.report_store import save_json_artifact, ANALYSIS_RESULTS_DIR
+from utils.fortnite_replay_parser.normalizer import normalize_events
+
+
+def stale_modules(report: dict) -> list:
+    """
+    Return the analysis sections whose stored version differs from the current module.
+    Reports saved before versioning count as fully stale.
+    """
+    stored = report.get("module_versions", {})
+    return [name for name, version in ANALYZER_VERSIONS.items() if stored.get(name) != version]
+
+
+def reanalyze_match(result_dir, force: tuple = ()) -> list:
+    """
+    Recompute the stale (or forced) sections of one stored report from its saved
+    events.json and rebuild the summary. The players table is rebuilt from the saved
+    player_events.json if the replay came with its own partition. AI feedback is left as is.
+    Returns the names of the refreshed sections.
+    """
+    result_dir = Path(result_dir)
+    report_path = result_dir / "analysis_full.json"
+    events_path = result_dir / "events.json"
+    if not events_path.exists():
+        print(f"⚠️ No stored events for {result_dir.name}, reparse needed.")
+        return []
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    refresh = [name for name in stale_modules(report) if name in ANALYZERS]
+    refresh += [name for name in force if name in ANALYZERS and name not in refresh]
+    summary_stale = "summary" in stale_modules(report) or "summary" in force
+    if not refresh and not summary_stale:
+        return []
+
+    with open(events_path, "r", encoding="utf-8") as f:
+        events = normalize_events(json.load(f))
+
+    analysis = report.setdefault("analysis", {})
+    for name in refresh:
+        analysis[name] = ANALYZERS[name](events)
+    analysis["summary"] = generate_match_summary(analysis)
+
+    if "players" in report:
+        player_events_path = result_dir / "player_events.json"
+        if player_events_path.exists():
+            with open(player_events_path, "r", encoding="utf-8") as f:
+                events_by_player = {pid: normalize_events(evs) for pid, evs in json.load(f).items()}
+        else:
+            events_by_player = partition_events_by_player(events)
+        report["players"] = run_lobby_analysis(events_by_player)
+
+    report["module_versions"] = dict(ANALYZER_VERSIONS)
+    save_json_artifact(report_path, report)
+    return refresh + ["summary"]
+
+
+def _reanalyze_one(args):
+    result_dir, force = args
+    try:
+        return result_dir.name, reanalyze_match(result_dir, force)
+    except Exception as e:
+        print(f"❌ Re-analysis failed for {result_dir.name}: {e}")
+        return result_dir.name, None
+
+
+def reanalyze_all(root=ANALYSIS_RESULTS_DIR, workers: int = None, force: tuple = ()) -> dict:
+    """
+    Refresh every stored report under root in parallel worker processes.
+    Returns {match: refreshed sections}, with None for matches that failed.
+    """
+    result_dirs = [p.parent for p in Path(root).glob("*/analysis_full.json")]
+    jobs = [(d, tuple(force)) for d in result_dirs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = dict(executor.map(_reanalyze_one, jobs, chunksize=16))
+
+    refreshed = sum(1 for sections in results.values() if sections)
+    print(f"🔁 Re-analyzed {refreshed}/{len(results)} stored match(es).")
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Recompute stale analysis modules for stored matches.")
+    arg_parser.add_argument("--root", default=str(ANALYSIS_RESULTS_DIR), help="Directory of stored analysis results")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--force", nargs="*", default=[], help="Modules to recompute even if up to date")
+    args = arg_parser.parse_args()
+    reanalyze_all(args.root, args.workers, tuple(args.force))
@@ -0,0 +1,137 @@
+# File: backend-python/utils/AIAnalysis/trajectory.py
+
+import os
+from math import dist
+
+# Max distance (same units as event positions) a dropped sample may lie from the simplified path
+DEFAULT_TOLERANCE = float(os.getenv("TRAJECTORY_TOLERANCE", 1.0))
+# Samples closer together than this many seconds are merged before simplification
+DEFAULT_MIN_INTERVAL = float(os.getenv("TRAJECTORY_MIN_INTERVAL", 0.25))
+
+
+def _segment_distance(p, a, b) -> float:
+    """Distance from point p to segment a-b (2D or 3D)."""
+    ab = [bi - ai for ai, bi in zip(a, b)]
+    length_sq = sum(c * c for c in ab)
+    if length_sq == 0:
+        return dist(p, a)
+    t = sum((pi - ai) * c for pi, ai, c in zip(p, a, ab)) / length_sq
+    t = max(0.0, min(1.0, t))
+    return dist(p, [ai + t * c for ai, c in zip(a, ab)])
+
+
+def douglas_peucker(points, tolerance: float) -> list:
+    """
+    Indices of the points kept by Douglas-Peucker simplification: every dropped
+    point lies within `tolerance` of the simplified polyline. Iterative, so long
+    tracks do not hit the recursion limit.
+    """
+    if len(points) < 3:
+        return list(range(len(points)))
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        a, b = points[start], points[end]
+        max_distance = -1.0
+        index = start
+        for i in range(start + 1, end):
+            d = _segment_distance(points[i], a, b)
+            if d > max_distance:
+                max_distance, index = d, i
+        if max_distance > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [i for i, kept in enumerate(keep) if kept]
+
+
+def _downsample(times, indices, min_interval: float) -> list:
+    """Keep the first index of each min_interval window (and always the last)."""
+    kept = [indices[0]]
+    for i in indices[1:-1]:
+        if times[i] is None or times[kept[-1]] is None or times[i] - times[kept[-1]] >= min_interval:
+            kept.append(i)
+    if len(indices) > 1:
+        kept.append(indices[-1])
+    return kept
+
+
+def _path_length(points) -> float:
+    return sum(dist(a, b) for a, b in zip(points, points[1:]))
+
+
+def _is_movement(event) -> bool:
+    return isinstance(event, dict) and event.get("type") == "movement" and event.get("position") is not None
+
+
+def compress_movement_events(events, tolerance: float = DEFAULT_TOLERANCE,
+                             min_interval: float = DEFAULT_MIN_INTERVAL):
+    """
+    Compress high-frequency movement events at ingest: samples closer than
+    min_interval are merged, then each player's track is simplified with
+    Douglas-Peucker at `tolerance`. Tracks are split wherever the movement mode
+    changes so sprint/walk totals stay exact.
+
+    A dropped event's distance, duration and sample count are folded into the
+    next kept event, so summed totals are unchanged; path length measured between
+    kept positions is the only approximation and its worst relative error is reported.
+    Non-movement events pass through untouched.
+
+    Returns (events, stats).
+    """
+    # Movement event indices per (player, run of same mode)
+    runs = []
+    current = {}
+    for i, event in enumerate(events):
+        if not _is_movement(event):
+            continue
+        player = event.get("player_id")
+        run = current.get(player)
+        if run is None or events[run[-1]].get("mode") != event.get("mode"):
+            run = current[player] = []
+            runs.append(run)
+        run.append(i)
+
+    drop = set()
+    merged = {}
+    max_error = 0.0
+    for run in runs:
+        times = {i: events[i].get("time") for i in run}
+        candidates = _downsample(times, run, min_interval) if min_interval > 0 else run
+        points = [tuple(events[i]["position"]) for i in candidates]
+        kept = [candidates[k] for k in douglas_peucker(points, tolerance)]
+
+        raw_length = _path_length([tuple(events[i]["position"]) for i in run])
+        kept_length = _path_length([tuple(events[i]["position"]) for i in kept])
+        if raw_length > 0:
+            max_error = max(max_error, (raw_length - kept_length) / raw_length)
+
+        # Fold dropped samples into the next kept one
+        kept_set = set(kept)
+        pending = {"distance": 0.0, "duration": 0.0, "samples": 0}
+        for i in run:
+            event = events[i]
+            pending["distance"] += event.get("distance", 0.0)
+            pending["duration"] += event.get("duration", 0.0)
+            pending["samples"] += event.get("samples", 1)
+            if i in kept_set:
+                if pending["samples"] > 1:
+                    merged[i] = {**event, **pending}
+                pending = {"distance": 0.0, "duration": 0.0, "samples": 0}
+            else:
+                drop.add(i)
+
+    compressed = [merged.get(i, event) for i, event in enumerate(events) if i not in drop]
+    points_in = sum(len(run) for run in runs)
+    stats = {
+        "tolerance": tolerance,
+        "min_interval": min_interval,
+        "points_in": points_in,
+        "points_out": points_in - len(drop),
+        "max_path_length_error": round(max_error, 4),
+    }
+    return compressed, stats
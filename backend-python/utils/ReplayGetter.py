@@ -2,22 +2,47 @@
 
 import os
 import json
+import argparse
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 
 from utils.AIAnalysis.match_analysis import run_match_analysis
-from utils.AIAnalysis.feedback.llm_assistant import generate_ai_feedback
+from utils.AIAnalysis.trajectory import compress_movement_events
 from utils.fortnite_replay_parser import ReplayParser
+from utils.pipeline_events import broadcaster
 
 # Root directory of the entire project
 ROOT_DIR = Path(__file__).resolve().parents[2]
 TRAINING_DATA_DIR = ROOT_DIR / "training_data"
 TRAINING_DATA_DIR.mkdir(exist_ok=True)
 
-def handle_new_replay(parsed_data: dict, output_dir: str):
+# Set LOBBY_ANALYSIS=1 to add the per-player lobby table to every ingested report
+LOBBY_ANALYSIS = os.getenv("LOBBY_ANALYSIS", "0") == "1"
+# Worker processes for the lobby table (0 = analyze players in-process)
+LOBBY_WORKERS = int(os.getenv("LOBBY_WORKERS", 0))
+
+def compress_trajectories(parsed_data: dict) -> dict:
+    """
+    Compress the movement events of a parsed replay (and of its per-player partition) in place.
+    Returns the compression stats, also stored as parsed_data["trajectory"].
+    """
+    parsed_data["events"], parsed_data["trajectory"] = compress_movement_events(parsed_data.get("events", []))
+    if parsed_data.get("player_events"):
+        parsed_data["player_events"] = {
+            pid: compress_movement_events(evs)[0] for pid, evs in parsed_data["player_events"].items()
+        }
+    return parsed_data["trajectory"]
+
+def handle_new_replay(parsed_data: dict, output_dir: str, skip_feedback: bool = False,
+                      per_player: bool = LOBBY_ANALYSIS, workers: int = LOBBY_WORKERS):
     """
     Process a parsed replay: run analysis, generate feedback, and save training data.
+    With skip_feedback, only the analysis runs (no LLM call, no training example).
+    With per_player, every player in the lobby is analyzed as well.
     """
+    replay_name = Path(output_dir).name
 
     print("🔎 Parsed replay summary:")
     for key, section in parsed_data.items():
@@ -34,28 +59,58 @@ def handle_new_replay(parsed_data: dict, output_dir: str):
     ):
         print("⚠️  Warning: All analysis data is zero or empty. Replay may not have parsed correctly.")
         print("🧪 Skipping analysis and feedback generation.")
+        broadcaster.publish(replay_name, "failed", error="Replay data is empty")
         return
 
+    # Simplify movement tracks once, so analysis, events.json and training logs all store the compact form
+    trajectory = compress_trajectories(parsed_data)
+    if trajectory["points_in"]:
+        print(f"🗜️ Movement points: {trajectory['points_in']} → {trajectory['points_out']} "
+              f"(path length error {trajectory['max_path_length_error']:.2%})")
+
+    # Rule-based feedback is published first; an in-time LLM answer replaces it later
+    feedback_lock = threading.Lock()
+    llm_answered = threading.Event()
+
+    def publish_feedback(feedback: str, from_llm: bool = False):
+        with feedback_lock:
+            if llm_answered.is_set():
+                return
+            if from_llm:
+                llm_answered.set()
+            broadcaster.publish(replay_name, "feedback_ready", feedback=feedback)
+
+    def on_llm_feedback(report: dict):
+        publish_feedback(report["ai_feedback"], from_llm=True)
+        save_training_example(parsed_data.get("events", []), report)
+
     # 1. Run match analysis
-    results = run_match_analysis(parsed_data, output_dir)
+    results = run_match_analysis(parsed_data, output_dir, per_player=per_player, workers=workers,
+                                 generate_feedback=not skip_feedback, on_llm_feedback=on_llm_feedback)
+    broadcaster.publish(replay_name, "analyzed", summary=results.get("analysis", {}).get("summary", {}))
+
+    if skip_feedback:
+        broadcaster.publish(replay_name, "done")
+        return
 
-    # 2. Generate feedback from LLM
-    feedback = generate_ai_feedback(results)
+    # 2-3. Publish the feedback stored in the report (and in feedback.txt / feedback.json)
+    publish_feedback(results["ai_feedback"])
 
-    # 3. Save feedback to feedback.json
-    feedback_path = os.path.join(output_dir, "feedback.json")
-    with open(feedback_path, "w", encoding="utf-8") as f:
-        json.dump(feedback, f, indent=2)
-    print(f"✅ Saved feedback to {feedback_path}")
+    # 4. The fine-tuning example is saved by on_llm_feedback, only if the LLM answers in time
 
-    # 4. Save full input/output for future LLM fine-tuning
+def save_training_example(events: list, report: dict):
+    """
+    Save the full input/output of a match for future LLM fine-tuning.
+    Only called with LLM feedback, so rule-based text never becomes a training target.
+    """
     log = {
         "input": {
-            "events": parsed_data.get("events", []),
-            "analysis": results
+            "events": events,
+            "analysis": {k: v for k, v in report.items() if k != "ai_feedback"}
         },
         "output": {
-            "feedback": feedback
+            "feedback": report["ai_feedback"],
+            "source": "llm"
         }
     }
 
@@ -65,23 +120,82 @@ def handle_new_replay(parsed_data: dict, output_dir: str):
         json.dump(log, f, indent=2)
     print(f"📁 Saved LLM training example to: {example_path}")
 
-def parse_and_analyze(replay_path: Path):
+def parse_and_analyze(replay_path: Path, skip_feedback: bool = False, per_player: bool = LOBBY_ANALYSIS):
     """
     End-to-end parsing and analysis for a single replay file.
     """
     print(f"📥 Starting parse for: {replay_path.name}")
+    broadcaster.publish(replay_path.stem, "started", file=replay_path.name)
 
     try:
         replay = ReplayParser(str(replay_path))
         replay.parse()
         parsed_data = replay.to_dict()
+        broadcaster.publish(replay_path.stem, "parsed", chunks=len(replay.chunks), events=len(replay.event_texts))
 
         output_dir = Path("database/analysis_results") / replay_path.stem
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        handle_new_replay(parsed_data, str(output_dir))
+        handle_new_replay(parsed_data, str(output_dir), skip_feedback, per_player)
         return parsed_data  # ✅ useful if Flask route needs the results
 
     except Exception as e:
         print(f"❌ Failed to parse and analyze {replay_path.name}: {e}")
+        broadcaster.publish(replay_path.stem, "failed", error=str(e))
         return None
+
+
+def analyze_without_saving(replay_path: Path, per_player: bool = LOBBY_ANALYSIS):
+    """
+    Parse, compress and analyze a replay like parse_and_analyze, but into a throwaway
+    directory, with no feedback and no pipeline events, so stored results are untouched.
+    """
+    replay = ReplayParser(str(replay_path))
+    replay.parse()
+    parsed_data = replay.to_dict()
+    compress_trajectories(parsed_data)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        return run_match_analysis(parsed_data, output_dir, per_player=per_player, generate_feedback=False)
+
+
+def profile_replay(replay_path: Path, output_dir: Path, deterministic: bool = False,
+                   skip_feedback: bool = False, interval: float = 0.005, top: int = 25,
+                   memory: bool = False):
+    """
+    Run parse_and_analyze on one replay under the profiler and write the report to output_dir.
+    With memory, a second run traces allocations through analyze_without_saving, so it
+    makes no LLM call, publishes no pipeline events and leaves the stored report alone.
+    """
+    from utils.profiling import profile_call
+
+    return profile_call(
+        parse_and_analyze, replay_path, skip_feedback,
+        output_dir=output_dir, deterministic=deterministic, interval=interval, top=top, memory=memory,
+        memory_call=lambda: analyze_without_saving(replay_path)
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Parse and analyze a replay, optionally under the profiler.")
+    arg_parser.add_argument("replay", nargs="?", help="Replay file to process")
+    arg_parser.add_argument("--profile", metavar="REPLAY", help="Profile processing of this replay")
+    arg_parser.add_argument("--deterministic", action="store_true", help="Also run cProfile for exact call counts and times")
+    arg_parser.add_argument("--no-llm", action="store_true", help="Skip the LLM feedback stage")
+    arg_parser.add_argument("--per-player", action="store_true", help="Also analyze every player in the lobby")
+    arg_parser.add_argument("--memory", action="store_true", help="Add a tracemalloc allocation report (second run)")
+    arg_parser.add_argument("--interval", type=float, default=0.005, help="Sampling interval in seconds")
+    arg_parser.add_argument("--top", type=int, default=25, help="Rows in the function and memory reports")
+    arg_parser.add_argument("--out", help="Profile output directory (default: profiles/<replay>_<timestamp>)")
+    args = arg_parser.parse_args()
+
+    if args.profile:
+        replay_path = Path(args.profile)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_dir = Path(args.out) if args.out else ROOT_DIR / "profiles" / f"{replay_path.stem}_{timestamp}"
+        profile_replay(replay_path, out_dir, args.deterministic, args.no_llm, args.interval, args.top,
+                       args.memory)
+    elif args.replay:
+        parse_and_analyze(Path(args.replay), args.no_llm, args.per_player or LOBBY_ANALYSIS)
+    else:
+        arg_parser.print_help()
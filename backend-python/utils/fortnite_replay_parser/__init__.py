@@ -3,7 +3,10 @@
 import os
 import struct
 import json
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from utils.fortnite_replay_parser.replay_data import ReplayDataDecoder
 
 CHUNK_TYPE_MAP = {
     1: "Checkpoint",
@@ -11,18 +14,71 @@ CHUNK_TYPE_MAP = {
     3: "ReplayData"
 }
 
+HEADER_SIZE = 32
+CHUNK_HEADER_SIZE = 12
+
 class ReplayParser:
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.metadata = {}
         self.chunks = []
         self.event_texts = []
+        self.checkpoint_index = None  # [(time, offset)] of Checkpoint chunks
+        self.replay_data = ReplayDataDecoder()
 
     def parse(self):
         with open(self.filepath, 'rb') as f:
             self._parse_header(f)
             self._parse_chunks(f)
 
+    def build_checkpoint_index(self) -> List[Tuple[int, int]]:
+        """
+        Scan chunk headers only (payloads are skipped, not read) and record the
+        time and file offset of every Checkpoint chunk.
+        """
+        index = []
+        with open(self.filepath, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            offset = HEADER_SIZE
+            while offset + CHUNK_HEADER_SIZE <= file_size:
+                f.seek(offset)
+                chunk_type, size, time = struct.unpack('<III', f.read(CHUNK_HEADER_SIZE))
+                if chunk_type == 1:
+                    index.append((time, offset))
+                offset += CHUNK_HEADER_SIZE + size
+
+        index.sort()
+        self.checkpoint_index = index
+        return index
+
+    def seek(self, time: int, until: Optional[int] = None) -> int:
+        """
+        Jump to the nearest Checkpoint at or before `time` (same units as chunk
+        timestamps) and decode forward from there, stopping after `until` if given
+        (e.g. for clip extraction). Before the first checkpoint, decoding starts at
+        the first chunk.
+        Replaces self.chunks / self.event_texts and returns the start offset used.
+
+        Checkpoint payloads are not decoded yet, so this does not restore the game
+        state at the checkpoint: chunks before it (eliminations, damage, ...) are
+        simply not read. Use parse() for whole-match totals.
+        """
+        if self.checkpoint_index is None:
+            self.build_checkpoint_index()
+
+        offset = HEADER_SIZE
+        pos = bisect_right(self.checkpoint_index, (time, float('inf')))
+        if pos:
+            offset = self.checkpoint_index[pos - 1][1]
+
+        self.chunks = []
+        self.event_texts = []
+        self.replay_data.reset()
+        with open(self.filepath, 'rb') as f:
+            self._parse_header(f)
+            self._parse_chunks(f, offset, until)
+        return offset
+
     def _parse_header(self, f):
         f.seek(0)
         header_data = f.read(32)
@@ -34,20 +90,25 @@ class ReplayParser:
         self.metadata['version_major'] = version_major
         self.metadata['version_minor'] = version_minor
 
-    def _parse_chunks(self, f):
-        f.seek(32)
+    def _parse_chunks(self, f, start: int = HEADER_SIZE, until: Optional[int] = None):
+        f.seek(start)
+        checkpoints = []
         while True:
-            chunk_header = f.read(12)
-            if len(chunk_header) < 12:
+            offset = f.tell()
+            chunk_header = f.read(CHUNK_HEADER_SIZE)
+            if len(chunk_header) < CHUNK_HEADER_SIZE:
                 break
             try:
                 chunk_type, size, time = struct.unpack('<III', chunk_header)
+                if until is not None and time > until:
+                    break
                 data = f.read(size)
                 chunk_info = {
                     'type': chunk_type,
                     'type_name': CHUNK_TYPE_MAP.get(chunk_type, f"Unknown_{chunk_type}"),
                     'size': size,
                     'time': time,
+                    'offset': offset,
                 }
 
                 # Decode based on type
@@ -60,14 +121,25 @@ class ReplayParser:
                     if 'raw_text' in decoded:
                         self.event_texts.append(decoded['raw_text'])
 
+                elif chunk_type == 1:  # Checkpoint
+                    checkpoints.append((time, offset))
+
                 self.chunks.append(chunk_info)
             except struct.error:
                 break
 
+        # A full parse sees every checkpoint, so seek() can reuse the index
+        if start == HEADER_SIZE and until is None:
+            self.checkpoint_index = sorted(checkpoints)
+
     def _decode_replay_data(self, data: bytes) -> Dict:
+        truncated = self.replay_data.truncated_chunks
+        records = self.replay_data.decode(data)
         return {
             "byte_length": len(data),
-            "example_bytes": list(data[:16])
+            "example_bytes": list(data[:16]),
+            "records": records,
+            "truncated": self.replay_data.truncated_chunks > truncated
         }
 
     def _decode_event_chunk(self, data: bytes) -> Dict:
@@ -174,6 +246,8 @@ class ReplayParser:
                     'zone_safety': 0
                 }
             },
+            # Decoded with a provisional record layout: kept apart from the analysis totals
+            'replay_data': self.replay_data.summary(),
             'events': self.event_texts
         }
 
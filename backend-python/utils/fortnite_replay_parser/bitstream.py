@@ -0,0 +1,160 @@
+# File: backend-python/utils/fortnite_replay_parser/bitstream.py
+
+import struct
+
+# MASKS[n] keeps the low n bits of an int
+MASKS = tuple((1 << n) - 1 for n in range(65))
+
+_FLOAT = struct.Struct('<f')
+
+
+class BitReader:
+    """
+    LSB-first bit reader over a memoryview, following Unreal's FBitReader layout.
+    Reads are done on whole bytes with shifts and precomputed masks; no per-bit
+    objects are created. Call reset() to reuse the reader for another buffer.
+    """
+    __slots__ = ("_view", "_num_bits", "pos")
+
+    def __init__(self, data: bytes = b""):
+        self.reset(data)
+
+    def reset(self, data: bytes):
+        self._view = memoryview(data)
+        self._num_bits = len(self._view) * 8
+        self.pos = 0
+
+    def bits_left(self) -> int:
+        return self._num_bits - self.pos
+
+    def read_bit(self) -> int:
+        pos = self.pos
+        if pos >= self._num_bits:
+            raise ValueError("Read past end of bitstream")
+        self.pos = pos + 1
+        return (self._view[pos >> 3] >> (pos & 7)) & 1
+
+    def read_bits(self, count: int) -> int:
+        pos = self.pos
+        end = pos + count
+        if end > self._num_bits:
+            raise ValueError("Read past end of bitstream")
+        self.pos = end
+        value = int.from_bytes(self._view[pos >> 3:(end + 7) >> 3], 'little') >> (pos & 7)
+        return value & (MASKS[count] if count <= 64 else (1 << count) - 1)
+
+    def read_bytes(self, count: int) -> bytes:
+        pos = self.pos
+        if not pos & 7:
+            end = pos + count * 8
+            if end > self._num_bits:
+                raise ValueError("Read past end of bitstream")
+            self.pos = end
+            return self._view[pos >> 3:end >> 3].tobytes()
+        return self.read_bits(count * 8).to_bytes(count, 'little')
+
+    def read_packed_int(self) -> int:
+        """Unreal SerializeIntPacked: 7 value bits per byte, low bit flags continuation."""
+        value = 0
+        shift = 0
+        while True:
+            byte = self.read_bits(8)
+            value |= (byte >> 1) << shift
+            if not byte & 1:
+                return value
+            shift += 7
+
+    def read_int_max(self, max_value: int) -> int:
+        """Unreal SerializeInt: an int in [0, max_value)."""
+        if max_value & (max_value - 1) == 0:
+            return self.read_bits(max_value.bit_length() - 1)
+        value = 0
+        mask = 1
+        while value + mask < max_value:
+            if self.read_bit():
+                value |= mask
+            mask <<= 1
+        return value
+
+    def read_float(self) -> float:
+        pos = self.pos
+        if not pos & 7 and pos + 32 <= self._num_bits:
+            self.pos = pos + 32
+            return _FLOAT.unpack_from(self._view, pos >> 3)[0]
+        return _FLOAT.unpack(self.read_bits(32).to_bytes(4, 'little'))[0]
+
+    def read_packed_vector(self, scale: int, max_bits: int):
+        """Unreal ReadPackedVector: quantized (x, y, z) with a shared per-vector bit width."""
+        bits = self.read_int_max(max_bits)
+        bias = 1 << (bits + 1)
+        width = bits + 2
+        x = self.read_bits(width) - bias
+        y = self.read_bits(width) - bias
+        z = self.read_bits(width) - bias
+        return x / scale, y / scale, z / scale
+
+
+class BitWriter:
+    """
+    Counterpart of BitReader, used to build synthetic payloads for tests and benchmarks.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._acc = 0
+        self._acc_bits = 0
+
+    def write_bits(self, value: int, count: int):
+        self._acc |= (value & ((1 << count) - 1)) << self._acc_bits
+        self._acc_bits += count
+        while self._acc_bits >= 8:
+            self._buffer.append(self._acc & 0xFF)
+            self._acc >>= 8
+            self._acc_bits -= 8
+
+    def write_bit(self, value: int):
+        self.write_bits(1 if value else 0, 1)
+
+    def write_bytes(self, data: bytes):
+        for byte in data:
+            self.write_bits(byte, 8)
+
+    def write_packed_int(self, value: int):
+        while True:
+            byte = (value & 0x7F) << 1
+            value >>= 7
+            if value:
+                self.write_bits(byte | 1, 8)
+            else:
+                self.write_bits(byte, 8)
+                return
+
+    def write_int_max(self, value: int, max_value: int):
+        if max_value & (max_value - 1) == 0:
+            self.write_bits(value, max_value.bit_length() - 1)
+            return
+        mask = 1
+        written = 0
+        while written + mask < max_value:
+            bit = value & mask
+            self.write_bit(bit)
+            written |= bit
+            mask <<= 1
+
+    def write_float(self, value: float):
+        self.write_bits(int.from_bytes(_FLOAT.pack(value), 'little'), 32)
+
+    def write_packed_vector(self, vector, scale: int, max_bits: int):
+        scaled = [int(round(c * scale)) for c in vector]
+        bits = max(max(abs(c) for c in scaled).bit_length(), 1)
+        bits = min(bits, max_bits - 1)
+        bias = 1 << (bits + 1)
+        self.write_int_max(bits, max_bits)
+        for c in scaled:
+            self.write_bits(c + bias, bits + 2)
+
+    def getvalue(self) -> bytes:
+        """Return the written bytes, zero-padding the final partial byte."""
+        if self._acc_bits:
+            return bytes(self._buffer) + bytes([self._acc & 0xFF])
+        return bytes(self._buffer)
@@ -0,0 +1,152 @@
+# File: backend-python/utils/fortnite_replay_parser/normalizer.py
+
+import re
+import sys
+from typing import Iterable, List, Optional
+
+# Event schema: how raw Event-chunk text maps to typed events.
+#   type     event type the analysis modules expect
+#   trigger  regex identifying the event (the earliest trigger in a text wins)
+#   fields   optional regex with named groups for extra fields
+#   const    fields with fixed values
+EVENT_SCHEMA = [
+    {"type": "elimination", "trigger": r"Elimination|Kill"},
+    {"type": "damage", "trigger": r"DamageDealt", "fields": r"DamageDealt\D*(?P<amount>\d+)", "const": {"target": "enemy"}},
+    {"type": "damage", "trigger": r"DamageTaken", "fields": r"DamageTaken\D*(?P<amount>\d+)", "const": {"target": "self"}},
+    {"type": "headshot", "trigger": r"Headshot"},
+    {"type": "shot_fired", "trigger": r"ShotFired|WeaponFired"},
+    {"type": "zone_enter", "trigger": r"SafeZone"},
+    {"type": "jump", "trigger": r"Jump"},
+    {"type": "build", "trigger": r"Build|Structure", "fields": r"(?i:\b(?P<material>wood|brick|metal)\b)"},
+    {"type": "edit", "trigger": r"Edit"},
+]
+
+# Player id, looked for in every event text
+PLAYER_PATTERN = r"Player(?:Id)?\s*[=:]\s*(?P<player_id>[\w-]+)"
+
+# Event types interned to small integer codes, in first-seen schema order
+EVENT_TYPES = tuple(dict.fromkeys(sys.intern(rule["type"]) for rule in EVENT_SCHEMA))
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+# Fields readable by key, besides "type"; the integer code stays internal
+EVENT_FIELDS = ("player_id", "amount", "target", "material")
+
+
+class EventRecord:
+    """
+    Compact typed event. Supports the dict-style access the analysis modules
+    use (event["type"], event.get("amount", 0)) without a per-event dict.
+    """
+    __slots__ = ("code", "player_id", "amount", "target", "material")
+
+    def __init__(self, code: int, player_id=None, amount=None, target=None, material=None):
+        self.code = code
+        self.player_id = player_id
+        self.amount = amount
+        self.target = target
+        self.material = material
+
+    @property
+    def type(self) -> str:
+        return EVENT_TYPES[self.code]
+
+    def __getitem__(self, key):
+        if key == "type":
+            return EVENT_TYPES[self.code]
+        if key in EVENT_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == "type":
+            return EVENT_TYPES[self.code]
+        if key in EVENT_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def to_dict(self) -> dict:
+        event = {"type": EVENT_TYPES[self.code]}
+        for key in EVENT_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                event[key] = value
+        return event
+
+    def __repr__(self):
+        return f"EventRecord({self.to_dict()})"
+
+
+class EventNormalizer:
+    """
+    Compile an event schema once into a single trigger regex plus a dispatch
+    table of per-rule field extractors, then turn raw texts into EventRecords.
+    """
+
+    def __init__(self, schema=EVENT_SCHEMA, player_pattern: str = PLAYER_PATTERN):
+        alternatives = []
+        self._dispatch = {}
+        for index, rule in enumerate(schema):
+            group = f"r{index}"
+            alternatives.append(f"(?P<{group}>{rule['trigger']})")
+            fields = rule.get("fields")
+            const = rule.get("const", {})
+            self._dispatch[group] = (
+                EVENT_CODES[rule["type"]],
+                re.compile(fields).search if fields else None,
+                const.get("target"),
+            )
+        self._trigger = re.compile("|".join(alternatives)).search
+        self._player = re.compile(player_pattern).search
+
+    def normalize_text(self, text: str) -> Optional[EventRecord]:
+        """Return the typed event for one raw event text, or None if no rule matches."""
+        match = self._trigger(text)
+        if match is None:
+            return None
+
+        code, fields_search, target = self._dispatch[match.lastgroup]
+        record = EventRecord(code, target=target)
+
+        if fields_search is not None:
+            fields = fields_search(text)
+            if fields is not None:
+                groups = fields.groupdict()
+                amount = groups.get("amount")
+                if amount is not None:
+                    record.amount = int(amount)
+                material = groups.get("material")
+                if material is not None:
+                    record.material = material.lower()
+
+        player = self._player(text)
+        if player is not None:
+            # Interned so a replay's records share one string per player; the
+            # interpreter drops it again once no record refers to it
+            record.player_id = sys.intern(player.group("player_id"))
+
+        return record
+
+    def normalize_all(self, events: Iterable) -> List:
+        """
+        Normalize a mixed event list: raw texts become EventRecords (unmatched ones
+        are dropped), already structured events pass through unchanged.
+        """
+        normalize_text = self.normalize_text
+        normalized = []
+        append = normalized.append
+        for event in events:
+            if isinstance(event, str):
+                event = normalize_text(event)
+                if event is None:
+                    continue
+            append(event)
+        return normalized
+
+
+# Shared normalizer, compiled once at import
+NORMALIZER = EventNormalizer()
+normalize_events = NORMALIZER.normalize_all
@@ -0,0 +1,240 @@
+# File: backend-python/utils/fortnite_replay_parser/replay_data.py
+
+import argparse
+import random
+import time
+from array import array
+from typing import Dict
+
+from utils.fortnite_replay_parser.bitstream import BitReader, BitWriter
+
+# ReplayData payloads are read as a stream of property records:
+#   packed int  actor handle
+#   4 bits      property type (index into PROPERTY_TYPES)
+#   ...         type-specific payload (see the _read_* methods)
+PROP_BOOL = 0
+PROP_INT = 1
+PROP_FLOAT = 2
+PROP_STRING = 3
+PROP_POSITION = 4
+PROP_DAMAGE = 5
+PROP_BUILD = 6
+
+PROPERTY_TYPES = ("bool", "int", "float", "string", "position", "damage", "build")
+PROPERTY_TYPE_BITS = 4
+MATERIALS = ("wood", "brick", "metal")
+
+# Quantization used for positions, matching Unreal's default packed vectors
+VECTOR_SCALE = 10
+VECTOR_MAX_BITS = 24
+
+# Smallest possible record: 1-byte handle + type bits
+RECORD_MIN_BITS = 8 + PROPERTY_TYPE_BITS
+
+# Largest values the typed buffers hold; anything bigger means the payload is misread
+MAX_UINT32 = 0xFFFFFFFF
+MAX_INT64 = (1 << 63) - 1
+
+
+class ReplayDataDecoder:
+    """
+    Decode ReplayData chunk payloads into columnar buffers.
+    The decoder and its reader are meant to be reused across every chunk of a
+    replay: decoded values accumulate in typed arrays until reset() is called.
+    """
+
+    def __init__(self):
+        self._reader = BitReader()
+        self._dispatch = (
+            self._read_bool,
+            self._read_int,
+            self._read_float,
+            self._read_string,
+            self._read_position,
+            self._read_damage,
+            self._read_build,
+        )
+
+        self.record_counts = [0] * len(PROPERTY_TYPES)
+        self.bools = array('B')
+        self.ints = array('q')
+        self.floats = array('d')
+        self.strings = []
+        self.position_handles = array('I')
+        self.positions = array('d')  # flat x, y, z triples
+        self.damage_handles = array('I')
+        self.damage_targets = array('I')
+        self.damage_amounts = array('I')
+        self.headshots = 0
+        self.builds = [0] * len(MATERIALS)
+        self.build_positions = array('d')
+        self.truncated_chunks = 0
+
+    def reset(self):
+        """Clear decoded values while keeping the allocated buffers."""
+        self.record_counts[:] = [0] * len(PROPERTY_TYPES)
+        self.builds[:] = [0] * len(MATERIALS)
+        for buffer in (self.bools, self.ints, self.floats, self.position_handles, self.positions,
+                       self.damage_handles, self.damage_targets, self.damage_amounts, self.build_positions):
+            del buffer[:]
+        self.strings.clear()
+        self.headshots = 0
+        self.truncated_chunks = 0
+
+    def decode(self, data: bytes) -> int:
+        """
+        Decode one payload and return the number of records read.
+        A malformed or truncated tail stops decoding of that payload only.
+        """
+        reader = self._reader
+        reader.reset(data)
+        read_packed_int = reader.read_packed_int
+        read_bits = reader.read_bits
+        bits_left = reader.bits_left
+        dispatch = self._dispatch
+        num_types = len(dispatch)
+        counts = self.record_counts
+        records = 0
+
+        try:
+            while bits_left() >= RECORD_MIN_BITS:
+                handle = read_packed_int()
+                if handle > MAX_UINT32:
+                    raise ValueError(f"Actor handle {handle} out of range")
+                prop_type = read_bits(PROPERTY_TYPE_BITS)
+                if prop_type >= num_types:
+                    raise ValueError(f"Unknown property type {prop_type}")
+                dispatch[prop_type](reader, handle)
+                counts[prop_type] += 1
+                records += 1
+        except (ValueError, OverflowError):
+            self.truncated_chunks += 1
+
+        return records
+
+    # -----------------------------
+    # Property readers
+    # -----------------------------
+
+    def _read_bool(self, reader, handle):
+        self.bools.append(reader.read_bit())
+
+    def _read_int(self, reader, handle):
+        value = reader.read_packed_int()
+        if value > MAX_INT64:
+            raise ValueError(f"Int property {value} out of range")
+        self.ints.append(value)
+
+    def _read_float(self, reader, handle):
+        self.floats.append(reader.read_float())
+
+    def _read_string(self, reader, handle):
+        length = reader.read_packed_int()
+        self.strings.append(reader.read_bytes(length).decode('utf-8', errors='ignore'))
+
+    def _read_position(self, reader, handle):
+        position = reader.read_packed_vector(VECTOR_SCALE, VECTOR_MAX_BITS)
+        self.position_handles.append(handle)
+        self.positions.extend(position)
+
+    def _read_damage(self, reader, handle):
+        # Read the whole record before appending so the damage columns stay aligned
+        target = reader.read_packed_int()
+        amount = reader.read_packed_int()
+        headshot = reader.read_bit()
+        if target > MAX_UINT32 or amount > MAX_UINT32:
+            raise ValueError("Damage record out of range")
+        self.damage_handles.append(handle)
+        self.damage_targets.append(target)
+        self.damage_amounts.append(amount)
+        self.headshots += headshot
+
+    def _read_build(self, reader, handle):
+        material = reader.read_int_max(len(MATERIALS))
+        position = reader.read_packed_vector(VECTOR_SCALE, VECTOR_MAX_BITS)
+        self.builds[material] += 1
+        self.build_positions.extend(position)
+
+    def summary(self) -> Dict:
+        return {
+            "records": dict(zip(PROPERTY_TYPES, self.record_counts)),
+            "position_samples": len(self.position_handles),
+            "damage_total": sum(self.damage_amounts),
+            "headshots": self.headshots,
+            "builds": dict(zip(MATERIALS, self.builds)),
+            "truncated_chunks": self.truncated_chunks,
+        }
+
+
+# -----------------------------
+# Synthetic payloads & benchmark
+# -----------------------------
+
+def build_synthetic_payload(num_records: int, seed: int = 0) -> bytes:
+    """
+    Build a ReplayData payload with a realistic mix of records (mostly positions).
+    """
+    rng = random.Random(seed)
+    writer = BitWriter()
+    weights = (2, 6, 4, 1, 70, 10, 7)
+
+    for prop_type in rng.choices(range(len(PROPERTY_TYPES)), weights=weights, k=num_records):
+        writer.write_packed_int(rng.randrange(1, 2000))
+        writer.write_bits(prop_type, PROPERTY_TYPE_BITS)
+
+        if prop_type == PROP_BOOL:
+            writer.write_bit(rng.random() < 0.5)
+        elif prop_type == PROP_INT:
+            writer.write_packed_int(rng.randrange(0, 1 << 20))
+        elif prop_type == PROP_FLOAT:
+            writer.write_float(rng.uniform(-1000, 1000))
+        elif prop_type == PROP_STRING:
+            text = rng.choice(("Pickaxe", "AssaultRifle", "PumpShotgun", "MedKit")).encode()
+            writer.write_packed_int(len(text))
+            writer.write_bytes(text)
+        elif prop_type == PROP_POSITION:
+            writer.write_packed_vector(
+                (rng.uniform(-1e5, 1e5), rng.uniform(-1e5, 1e5), rng.uniform(0, 5e3)),
+                VECTOR_SCALE, VECTOR_MAX_BITS
+            )
+        elif prop_type == PROP_DAMAGE:
+            writer.write_packed_int(rng.randrange(1, 2000))
+            writer.write_packed_int(rng.randrange(1, 200))
+            writer.write_bit(rng.random() < 0.2)
+        elif prop_type == PROP_BUILD:
+            writer.write_int_max(rng.randrange(len(MATERIALS)), len(MATERIALS))
+            writer.write_packed_vector(
+                (rng.uniform(-1e5, 1e5), rng.uniform(-1e5, 1e5), rng.uniform(0, 5e3)),
+                VECTOR_SCALE, VECTOR_MAX_BITS
+            )
+
+    return writer.getvalue()
+
+
+def benchmark(total_mb: float = 4.0, chunk_records: int = 2000) -> float:
+    """
+    Decode synthetic chunks totalling about total_mb and return throughput in MB/s.
+    """
+    chunk = build_synthetic_payload(chunk_records)
+    repeats = max(1, int(total_mb * 1024 * 1024 / len(chunk)))
+    decoder = ReplayDataDecoder()
+
+    start = time.perf_counter()
+    records = 0
+    for _ in range(repeats):
+        decoder.reset()
+        records += decoder.decode(chunk)
+    elapsed = time.perf_counter() - start
+
+    mb = len(chunk) * repeats / (1024 * 1024)
+    rate = mb / elapsed
+    print(f"📈 Decoded {mb:.2f} MB ({records} records) in {elapsed:.2f}s: {rate:.2f} MB/s")
+    return rate
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the ReplayData decoder on synthetic payloads.")
+    arg_parser.add_argument("--mb", type=float, default=4.0, help="Amount of payload data to decode")
+    arg_parser.add_argument("--chunk-records", type=int, default=2000, help="Records per synthetic chunk")
+    args = arg_parser.parse_args()
+    benchmark(args.mb, args.chunk_records)
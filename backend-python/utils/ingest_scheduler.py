@@ -0,0 +1,161 @@
+# File: backend-python/utils/ingest_scheduler.py
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+
+from utils.pipeline_events import broadcaster
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = 0  # /upload
+PRIORITY_WATCHER = 1      # fresh replay picked up by the watcher
+PRIORITY_BACKLOG = 2      # replays already on disk when the watcher started
+PRIORITY_NAMES = ("interactive", "watcher", "backlog")
+
+# Max queued jobs per class before submit() applies backpressure
+MAX_QUEUE_DEPTH = (8, 32, 256)
+
+# Peak RAM while processing a replay, estimated from its size on disk
+MEMORY_PER_REPLAY_BYTE = 12
+MEMORY_BASE_BYTES = 32 * 1024 * 1024
+DEFAULT_MEMORY_BUDGET_MB = int(os.getenv("INGEST_MEMORY_BUDGET_MB", 2048))
+DEFAULT_WORKERS = int(os.getenv("INGEST_WORKERS", 2))
+
+
+class QueueFull(Exception):
+    """Raised by submit() when a priority class is at its queue depth limit."""
+
+
+def estimate_job_memory(replay_path: Path) -> int:
+    try:
+        size = os.path.getsize(replay_path)
+    except OSError:
+        size = 0
+    return MEMORY_BASE_BYTES + size * MEMORY_PER_REPLAY_BYTE
+
+
+class IngestScheduler:
+    """
+    Single entry point for replay processing from the watcher and /upload.
+    Jobs run in priority order on a small worker pool, and a job only starts
+    when its estimated memory fits in what the running jobs leave of the budget
+    (a job larger than the whole budget runs alone).
+    """
+
+    def __init__(self, handler, workers: int = DEFAULT_WORKERS,
+                 memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB, max_depth=MAX_QUEUE_DEPTH):
+        self.handler = handler
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.max_depth = max_depth
+        self._queues = [deque() for _ in PRIORITY_NAMES]
+        self._memory_in_use = 0
+        self._running = 0
+        self._completed = 0
+        self._shutdown = False
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._worker, daemon=True, name=f"ingest-{i}")
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, replay_path, priority: int = PRIORITY_BACKLOG, block: bool = False,
+               timeout: float = None) -> Future:
+        """
+        Queue a replay for processing and return a Future with the handler's result.
+        If the priority class is full, raise QueueFull, or with block=True wait for room.
+        """
+        replay_path = Path(replay_path)
+        job = (replay_path, estimate_job_memory(replay_path), Future())
+
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler is shut down")
+            queue = self._queues[priority]
+            if len(queue) >= self.max_depth[priority]:
+                if not block or not self._cond.wait_for(
+                    lambda: len(queue) < self.max_depth[priority], timeout
+                ):
+                    raise QueueFull(f"{PRIORITY_NAMES[priority]} queue is full")
+            queue.append(job)
+            self._cond.notify_all()
+
+        # Dashboards see the replay as soon as it is queued, not when a worker reaches it
+        broadcaster.publish(replay_path.stem, "detected", file=replay_path.name, queue=PRIORITY_NAMES[priority])
+        return job[2]
+
+    def _next_job(self):
+        # Strict priority: only the head of the most urgent non-empty class is
+        # considered, so small backlog jobs cannot keep an upload waiting.
+        for queue in self._queues:
+            if queue:
+                _, memory, _ = queue[0]
+                if self._running == 0 or self._memory_in_use + memory <= self.memory_budget:
+                    return queue.popleft()
+                return None
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    if self._shutdown and not any(self._queues):
+                        return
+                    job = self._next_job()
+                    if job is None:
+                        self._cond.wait()
+                replay_path, memory, future = job
+                self._memory_in_use += memory
+                self._running += 1
+                # Room was freed in a queue for blocked submitters
+                self._cond.notify_all()
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(self.handler(replay_path))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._memory_in_use -= memory
+                    self._running -= 1
+                    self._completed += 1
+                    self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": {name: len(q) for name, q in zip(PRIORITY_NAMES, self._queues)},
+                "running": self._running,
+                "completed": self._completed,
+                "memory_in_use_mb": round(self._memory_in_use / 1024 / 1024, 1),
+                "memory_budget_mb": round(self.memory_budget / 1024 / 1024, 1),
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs; workers exit once the queues are drained."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> IngestScheduler:
+    """Shared scheduler running parse_and_analyze, created on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from utils.ReplayGetter import parse_and_analyze
+            _scheduler = IngestScheduler(parse_and_analyze)
+        return _scheduler
@@ -0,0 +1,104 @@
+# File: backend-python/utils/pipeline_events.py
+
+import json
+import queue
+import threading
+from itertools import count
+
+# Pipeline stages, in the order a replay goes through them
+# ("done" ends a run without feedback, e.g. --no-llm)
+STAGES = ("detected", "started", "parsed", "analyzed", "feedback_ready", "done", "failed")
+FINAL_STAGES = {"feedback_ready", "done", "failed"}
+
+
+def format_sse(message_id: int, event: str, data: str) -> str:
+    """Format one Server-Sent Events message."""
+    return f"id: {message_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+class EventBroadcaster:
+    """
+    Fan out pipeline events to every connected dashboard.
+    Each message is serialized once and only carries the fields that changed
+    since the last event for the same replay; a client that connects mid-pipeline
+    first gets a "snapshot" of every replay still in progress.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._state = {}
+        self._stages = {}
+        self._ids = count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        return self._subscribe()[0]
+
+    def _subscribe(self):
+        """Add a subscriber and return (queue, snapshot message or None), taken atomically."""
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.add(q)
+            if not self._state:
+                return q, None
+            replays = {replay: {"stage": self._stages[replay], **fields} for replay, fields in self._state.items()}
+            payload = json.dumps({"replays": replays}, separators=(",", ":"))
+            return q, format_sse(next(self._ids), "snapshot", payload)
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, replay: str, stage: str, **fields):
+        """
+        Push a stage change for a replay to all subscribers.
+        """
+        with self._lock:
+            previous = self._state.setdefault(replay, {})
+            diff = {k: v for k, v in fields.items() if previous.get(k) != v}
+            previous.update(diff)
+            self._stages[replay] = stage
+            if stage in FINAL_STAGES:
+                del self._state[replay]
+                del self._stages[replay]
+
+            message_id = next(self._ids)
+            payload = json.dumps({"replay": replay, "stage": stage, **diff}, separators=(",", ":"))
+            message = format_sse(message_id, stage, payload)
+
+            for q in self._subscribers:
+                try:
+                    q.put_nowait(message)
+                except queue.Full:
+                    # Slow client: drop its oldest message rather than block the pipeline
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    q.put_nowait(message)
+
+    def stream(self, heartbeat: float = 15.0):
+        """
+        Generator of SSE messages for one client, with periodic keep-alive comments.
+        """
+        q, snapshot = self._subscribe()
+        try:
+            yield ": connected\n\n"
+            if snapshot is not None:
+                yield snapshot
+            while True:
+                try:
+                    yield q.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(q)
+
+
+# Shared broadcaster used by the watcher, the upload route and the /events endpoint
+broadcaster = EventBroadcaster()
@@ -0,0 +1,143 @@
+# File: backend-python/utils/profiling.py
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Periodically sample the call stack of one thread and count collapsed stacks
+    ("root;caller;callee count"), the input format of flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="sampling-profiler")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def function_table(self, top: int = 25) -> str:
+        """Per-function self/total sample counts derived from the collapsed stacks."""
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+
+        lines = [f"{'self %':>7} {'total %':>8}  function", "-" * 60]
+        for label, total in total_counts.most_common(top):
+            lines.append(
+                f"{100 * self_counts[label] / self.samples:7.1f} "
+                f"{100 * total / self.samples:8.1f}  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def profile_call(func, *args, output_dir, deterministic: bool = False, interval: float = 0.005,
+                 top: int = 25, memory: bool = False, memory_call=None, **kwargs):
+    """
+    Run func(*args, **kwargs) under the sampling profiler (and cProfile if deterministic).
+    Writes to output_dir:
+      stacks.collapsed  flamegraph-ready collapsed stacks
+      functions.txt     per-function summary table
+      memory.txt        top allocation sites (if memory)
+    tracemalloc slows allocation-heavy code by an order of magnitude, so the memory
+    report comes from a second, separate run and does not skew the CPU profile.
+    That run calls memory_call() if given (e.g. a variant without side effects),
+    otherwise func again. Returns the result of the profiled run.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sampler = SamplingProfiler(interval)
+    profiler = cProfile.Profile() if deterministic else None
+
+    sampler.start()
+    if profiler:
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+        sampler.stop()
+
+    sampler.write_collapsed(output_dir / "stacks.collapsed")
+
+    if profiler:
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        table = stream.getvalue()
+    else:
+        table = sampler.function_table(top)
+    with open(output_dir / "functions.txt", "w", encoding="utf-8") as f:
+        f.write(f"Wall time: {elapsed:.3f}s, {sampler.samples} samples every {interval * 1000:.1f}ms\n\n")
+        f.write(table)
+    print(f"⏱️ Profiled in {elapsed:.2f}s ({sampler.samples} samples)")
+
+    if memory:
+        print("🧮 Tracing allocations (second run)...")
+        tracemalloc.start()
+        try:
+            if memory_call is not None:
+                memory_call()
+            else:
+                func(*args, **kwargs)
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        with open(output_dir / "memory.txt", "w", encoding="utf-8") as f:
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.2f} MB, still allocated: {current / 1024 / 1024:.2f} MB\n\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+        print(f"🧮 Peak traced memory: {peak / 1024 / 1024:.1f} MB")
+
+    print(f"📁 Profile written to: {output_dir}")
+    return result
@@ -3,8 +3,9 @@
 import os
 import time
 import json
+import threading
 from pathlib import Path
-from utils.ReplayGetter import parse_and_analyze
+from utils.ingest_scheduler import get_scheduler, PRIORITY_WATCHER, PRIORITY_BACKLOG
 
 REPLAY_FOLDER = Path(os.path.expandvars(r"%localappdata%\FortniteGame\Saved\Demos"))
 PROCESSED_LOG = Path("database/processed_replays.json")
@@ -17,25 +18,63 @@ if PROCESSED_LOG.exists():
 else:
     processed = set()
 
+# Replays submitted to the scheduler but not finished yet
+pending = set()
+processed_lock = threading.Lock()
+
+def _on_replay_done(name, future):
+    with processed_lock:
+        pending.discard(name)
+        error = future.exception()
+        if error is not None:
+            print(f"❌ Error parsing {name}: {error}")
+            return
+        processed.add(name)
+        with open(PROCESSED_LOG, "w") as f:
+            json.dump({"processed": list(processed)}, f)
+
+def mark_pending(name):
+    """
+    Claim a replay before it is written to the watched folder (e.g. by /upload),
+    so the watcher cannot queue it in between.
+    """
+    with processed_lock:
+        pending.add(name)
+
+def release_pending(name):
+    """Drop a claim whose replay was never submitted."""
+    with processed_lock:
+        pending.discard(name)
+
+def track_submitted(name, future):
+    """
+    Record a replay queued elsewhere (e.g. /upload) so the watcher does not queue it again.
+    """
+    mark_pending(name)
+    future.add_done_callback(lambda f: _on_replay_done(name, f))
+
 def start_replay_watcher():
     print(f"👀 Watching for new replays in: {REPLAY_FOLDER}")
     print(f"✅ {len(processed)} replay(s) already processed.")
 
+    scheduler = get_scheduler()
+    # Replays already on disk at startup are backlog; later ones are fresh
+    priority = PRIORITY_BACKLOG
+
     try:
         while True:
             for replay_path in REPLAY_FOLDER.glob("*.replay"):
-                if replay_path.name in processed:
-                    continue
-
-                try:
-                    print(f"🆕 New replay found: {replay_path.name}")
-                    parse_and_analyze(replay_path)
-                    processed.add(replay_path.name)
-                    with open(PROCESSED_LOG, "w") as f:
-                        json.dump({"processed": list(processed)}, f)
-                except Exception as e:
-                    print(f"❌ Error parsing {replay_path.name}: {e}")
+                with processed_lock:
+                    if replay_path.name in processed or replay_path.name in pending:
+                        continue
+                    pending.add(replay_path.name)
+
+                print(f"🆕 New replay found: {replay_path.name}")
+                # Blocks while the queue is full, which throttles backlog imports
+                future = scheduler.submit(replay_path, priority, block=True)
+                future.add_done_callback(lambda f, name=replay_path.name: _on_replay_done(name, f))
 
+            priority = PRIORITY_WATCHER
             time.sleep(POLL_INTERVAL)
 
     except KeyboardInterrupt:
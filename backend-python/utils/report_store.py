@@ -0,0 +1,176 @@
+# File: backend-python/utils/report_store.py
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # brotli variants are optional
+    brotli = None
+
+ANALYSIS_RESULTS_DIR = Path("database/analysis_results")
+
+# Precompressed variants, in server preference order: (content-encoding, suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_etag_cache = {}
+_etag_lock = threading.Lock()
+
+
+def write_bytes_atomic(path, data: bytes):
+    """
+    Write data to a temp file next to path, then swap it into place in one step.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_artifact(path, data: bytes):
+    """
+    Atomically write a served artifact plus its precompressed .gz (and .br if
+    brotli is installed) variants, so requests never compress on the fly.
+    """
+    write_bytes_atomic(path, data)
+    write_bytes_atomic(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_bytes_atomic(f"{path}.br", brotli.compress(data, quality=11))
+
+
+def save_json_artifact(path, obj):
+    save_artifact(path, json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def save_feedback(result_dir, feedback: str):
+    """Write a report's feedback.txt (with compressed variants) and feedback.json."""
+    save_artifact(os.path.join(result_dir, "feedback.txt"), feedback.encode("utf-8"))
+    write_bytes_atomic(os.path.join(result_dir, "feedback.json"), json.dumps(feedback, indent=2).encode("utf-8"))
+
+
+def store_feedback(result_dir, report: dict, feedback: str) -> dict:
+    """
+    Replace the feedback of a stored report: analysis_full.json, feedback.txt and
+    feedback.json are rewritten together so every route serves the same text.
+    """
+    report = {**report, "ai_feedback": feedback}
+    save_json_artifact(os.path.join(result_dir, "analysis_full.json"), report)
+    save_feedback(result_dir, feedback)
+    return report
+
+
+def artifact_etag(path) -> str:
+    """
+    Content-hash ETag of an artifact, cached per file version (mtime + size)
+    so each file is hashed once.
+    """
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _etag_lock:
+        etag = _etag_cache.get(key)
+    if etag is None:
+        with open(path, "rb") as f:
+            etag = hashlib.sha256(f.read()).hexdigest()[:32]
+        with _etag_lock:
+            if len(_etag_cache) > 4096:
+                _etag_cache.clear()
+            _etag_cache[key] = etag
+    return etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    True if an If-None-Match header matches etag, ignoring weak prefixes and
+    the per-encoding suffixes added by select_variant.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value (default 1)."""
+    weights = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    return weights
+
+
+def select_variant(path, accept_encoding: str):
+    """
+    Pick the precompressed variant the client accepts with the highest q-value
+    (server preference breaks ties); codings with q=0 are refused.
+    Returns (file path, content-encoding or None, ETag suffix).
+    A variant older than the artifact itself is ignored.
+    """
+    weights = parse_accept_encoding(accept_encoding)
+    source_mtime = os.stat(path).st_mtime_ns
+    candidates = []
+    for rank, (encoding, suffix) in enumerate(ENCODINGS):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        variant = f"{path}{suffix}"
+        if q > 0 and os.path.exists(variant) and os.stat(variant).st_mtime_ns >= source_mtime:
+            candidates.append((-q, rank, variant, encoding))
+    if candidates:
+        _, _, variant, encoding = min(candidates)
+        return variant, encoding, f"-{encoding}"
+    return str(path), None, ""
+
+
+def projection_etag(etag: str, fields: list) -> str:
+    return f"{etag}-f{hashlib.sha256(','.join(fields).encode()).hexdigest()[:8]}"
+
+
+@lru_cache(maxsize=64)
+def _load_json(path: str, etag: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def project_report(path, etag: str, fields: list) -> dict:
+    """
+    Keep only the requested fields of a stored report. Names may be analysis
+    sections (summary, combat, ...) or top-level keys (metadata, players, ai_feedback).
+    """
+    report = _load_json(str(path), etag)
+    analysis = report.get("analysis", {})
+    projected = {}
+    for field in fields:
+        if field in analysis:
+            projected.setdefault("analysis", {})[field] = analysis[field]
+        elif field in report:
+            projected[field] = report[field]
+    return projected
+
+
+def list_reports(root=ANALYSIS_RESULTS_DIR) -> list:
+    return sorted(p.parent.name for p in Path(root).glob("*/analysis_full.json"))
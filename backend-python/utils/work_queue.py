@@ -0,0 +1,288 @@
+# File: backend-python/utils/work_queue.py
+
+import argparse
+import hashlib
+import importlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from pathlib import Path
+
+DEFAULT_QUEUE_URL = "sqlite:///database/work_queue.sqlite"
+DEFAULT_LEASE_SECONDS = 120
+MAX_ATTEMPTS = 3
+
+# A leased job: `token` must be passed back to heartbeat/complete/fail
+Lease = namedtuple("Lease", ["key", "path", "token", "attempts"])
+
+
+def replay_hash(replay_path) -> str:
+    """SHA-256 of the replay file; the job key, so one replay is processed once."""
+    digest = hashlib.sha256()
+    with open(replay_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkQueue(ABC):
+    """
+    Interface for ingestion queues. Workers lease a job, heartbeat while they
+    run it, then complete or fail it. A lease that stops heartbeating expires
+    and the job becomes available to other workers.
+    """
+
+    @abstractmethod
+    def enqueue(self, replay_path) -> str:
+        """Add a replay; returns its job key."""
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """Take the oldest available job as a Lease, or None if there is none."""
+
+    @abstractmethod
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease; False if it was lost."""
+
+    @abstractmethod
+    def complete(self, lease: Lease) -> bool:
+        """Mark a leased job done."""
+
+    @abstractmethod
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Release a leased job after an error."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Job counts per state."""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    WorkQueue stored in a SQLite file, usable by worker processes on any node
+    that mounts the same storage. Leases are taken inside BEGIN IMMEDIATE
+    transactions so two workers never get the same job.
+    """
+
+    def __init__(self, db_path, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = str(db_path)
+        self.max_attempts = max_attempts
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_token TEXT,
+                    lease_expires REAL,
+                    enqueued_at REAL NOT NULL,
+                    completed_at REAL,
+                    error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, enqueued_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread (the heartbeat runs on its own thread)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, replay_path) -> str:
+        """Add a replay unless the same file (by content) is already queued or done."""
+        key = replay_hash(replay_path)
+        self._connect().execute(
+            "INSERT OR IGNORE INTO jobs (key, path, enqueued_at) VALUES (?, ?, ?)",
+            (key, str(replay_path), time.time())
+        )
+        return key
+
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        conn = self._connect()
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT key, path, attempts FROM jobs "
+                    "WHERE state = 'queued' OR (state = 'leased' AND lease_expires < ?) "
+                    "ORDER BY enqueued_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                key, path, attempts = row
+                if attempts >= self.max_attempts:
+                    # Expired lease on the last attempt: the worker died every time
+                    conn.execute(
+                        "UPDATE jobs SET state = 'failed', error = 'Lease expired', lease_token = NULL WHERE key = ?",
+                        (key,)
+                    )
+                    conn.execute("COMMIT")
+                    continue
+
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_token = ?, lease_expires = ? WHERE key = ?",
+                    (worker_id, token, now + lease_seconds, key)
+                )
+                conn.execute("COMMIT")
+                return Lease(key, path, token, attempts + 1)
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease. False means it was lost (expired and taken by another worker)."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE key = ? AND lease_token = ? AND state = 'leased'",
+            (time.time() + lease_seconds, lease.key, lease.token)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, lease: Lease) -> bool:
+        """
+        Mark a job done. Completion is idempotent: a job that is already done
+        stays done, and a stale lease cannot complete a job now held by another worker.
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET state = 'done', completed_at = ?, lease_token = NULL, error = NULL "
+            "WHERE key = ? AND lease_token = ? AND state = 'leased'",
+            (time.time(), lease.key, lease.token)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Release a job after an error; it is retried until max_attempts is reached."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "error = ?, lease_token = NULL WHERE key = ? AND lease_token = ? AND state = 'leased'",
+            (self.max_attempts, error, lease.key, lease.token)
+        )
+        return cursor.rowcount == 1
+
+    def stats(self) -> dict:
+        rows = self._connect().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+
+def open_queue(url: str = DEFAULT_QUEUE_URL) -> WorkQueue:
+    """
+    Open a work queue by URL. Only sqlite:///<path> is built in; a networked
+    broker plugs in by implementing WorkQueue and adding its scheme here.
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteWorkQueue(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported work queue URL: {url}")
+
+
+def _default_handler(replay_path: Path):
+    from utils.ReplayGetter import parse_and_analyze
+    return parse_and_analyze(replay_path)
+
+
+def _load_handler(spec: str):
+    module_name, func_name = spec.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def run_worker(queue: WorkQueue, worker_id: str = None, handler=None,
+               lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 2.0,
+               exit_when_empty: bool = False) -> int:
+    """
+    Lease and process jobs until stopped (or until the queue is empty with
+    exit_when_empty). The lease is renewed in the background while a job runs.
+    Returns the number of jobs completed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    handler = handler or _default_handler
+    completed = 0
+    print(f"👷 Worker {worker_id} started.")
+
+    try:
+        while True:
+            lease = queue.lease(worker_id, lease_seconds)
+            if lease is None:
+                if exit_when_empty:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            print(f"📥 {worker_id} processing {Path(lease.path).name} (attempt {lease.attempts})")
+            stop = threading.Event()
+
+            def renew():
+                while not stop.wait(lease_seconds / 3):
+                    if not queue.heartbeat(lease, lease_seconds):
+                        print(f"⚠️ Lost lease on {Path(lease.path).name}")
+                        return
+
+            heartbeat_thread = threading.Thread(target=renew, daemon=True)
+            heartbeat_thread.start()
+            try:
+                result = handler(Path(lease.path))
+                error = None if result is not None else "Handler returned no result"
+            except Exception as e:
+                error = str(e)
+            finally:
+                stop.set()
+                heartbeat_thread.join()
+
+            if error is None:
+                if queue.complete(lease):
+                    completed += 1
+            else:
+                print(f"❌ {worker_id} failed {Path(lease.path).name}: {error}")
+                queue.fail(lease, error)
+
+    except KeyboardInterrupt:
+        print(f"👋 Stopping worker {worker_id}.")
+
+    return completed
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Distributed replay ingestion queue.")
+    arg_parser.add_argument("--queue", default=DEFAULT_QUEUE_URL, help="Queue URL (sqlite:///<path>)")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    enqueue_cmd = commands.add_parser("enqueue", help="Queue replay files or folders")
+    enqueue_cmd.add_argument("paths", nargs="+")
+
+    worker_cmd = commands.add_parser("worker", help="Run a worker process")
+    worker_cmd.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS, help="Lease length in seconds")
+    worker_cmd.add_argument("--exit-when-empty", action="store_true", help="Stop once no jobs are left")
+    worker_cmd.add_argument("--handler", help="Job handler as module:function (default: parse_and_analyze)")
+
+    commands.add_parser("stats", help="Show job counts per state")
+
+    args = arg_parser.parse_args()
+    queue = open_queue(args.queue)
+
+    if args.command == "enqueue":
+        added = 0
+        for path in map(Path, args.paths):
+            for replay_path in (sorted(path.glob("*.replay")) if path.is_dir() else [path]):
+                queue.enqueue(replay_path.resolve())
+                added += 1
+        print(f"✅ Submitted {added} replay(s); already known files are skipped.")
+    elif args.command == "worker":
+        handler = _load_handler(args.handler) if args.handler else None
+        run_worker(queue, handler=handler, lease_seconds=args.lease, exit_when_empty=args.exit_when_empty)
+    else:
+        print(queue.stats())